@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+# Measure the overhead per JSON node of decoding and serializing small documents,
+# where per-call costs like imports inside functions are not amortized, and write
+# the results as JSON. A checkout of another version, e.g. the one before a change,
+# is measured in the same way with `--baseline` to compare them.
+#
+#     git worktree add /tmp/baseline <commit>
+#     poetry run python benchmarks/per_node.py --baseline /tmp/baseline
+#
+# Each version is measured in its own process with the checkout on `PYTHONPATH`.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from dataclasses import dataclass
+from timeit import repeat
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class NameJson:
+    first: str
+    last: Optional[str]
+
+
+@dataclass(frozen=True)
+class UserJson:
+    id: str
+    age: int
+    name: NameJson
+    tags: List[str]
+
+
+# The number of JSON nodes in a user, i.e. the object and the values in it.
+_nodes = 9
+
+_user = {
+    "id": "jiji",
+    "age": 13,
+    "name": {"first": "Jiji", "last": None},
+    "tags": ["cat", "black"],
+}
+
+
+def _measure(function: Callable[[], Any], nodes: int) -> float:
+    # Each measurement goes through about the same number of nodes.
+    number = max(1, 100000 // nodes)
+    seconds = min(repeat(function, number=number, repeat=5))
+    return seconds / number / nodes * 1e9
+
+
+def measure() -> Dict[str, float]:
+    # Only the API of all the versions is used to measure them in the same way.
+    import typedjson
+    from typedjson.annotation import hints_of
+
+    users = [_user] * 100
+    user = typedjson.decode(UserJson, _user)
+    text = typedjson.dumps(user)
+
+    return {
+        "hints_of": _measure(lambda: hints_of(UserJson), 1),
+        "decode": _measure(lambda: typedjson.decode(UserJson, _user), _nodes),
+        "decode_list": _measure(
+            lambda: typedjson.decode(List[UserJson], users), _nodes * len(users) + 1
+        ),
+        "loads": _measure(lambda: typedjson.loads(UserJson, text), _nodes),
+        "dumps": _measure(lambda: typedjson.dumps(user), _nodes),
+    }
+
+
+def _measure_in(checkout: str) -> Dict[str, float]:
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(checkout))
+    command = [sys.executable, os.path.abspath(__file__), "--measure"]
+    output = subprocess.run(command, env=env, stdout=subprocess.PIPE, check=True)
+    return json.loads(output.stdout)  # type: ignore
+
+
+def run(baseline: Optional[str]) -> Dict[str, Any]:
+    current = _measure_in(os.path.join(os.path.dirname(__file__), os.pardir))
+    base = None if baseline is None else _measure_in(baseline)
+
+    results: List[Dict[str, Any]] = []
+    for operation, nanoseconds in current.items():
+        result = {"operation": operation, "ns_per_node": nanoseconds}
+        line = f"{operation:<16} {nanoseconds:8.1f} ns/node"
+        if base is not None and operation in base:
+            result["baseline_ns_per_node"] = base[operation]
+            result["ratio"] = nanoseconds / base[operation]
+            line += f" {base[operation]:8.1f} ns/node before {result['ratio']:6.2f}x"
+
+        results.append(result)
+        print(line, file=sys.stderr)
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "baseline": baseline,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure typedjson per JSON node.")
+    parser.add_argument("--baseline", help="a checkout of typedjson to compare with")
+    parser.add_argument("--output", type=argparse.FileType("w"), default=sys.stdout)
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        json.dump(measure(), sys.stdout)
+        return
+
+    report = run(args.baseline)
+    json.dump(report, args.output, indent=2)
+    args.output.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+# Measure the throughput and the peak memory of decoding, loading and dumping
+# synthetic documents, and write the results as JSON to compare them across versions.
+#
+#     poetry run python benchmarks/suite.py --output results.json
+#
+# Documents are generated from a fixed seed, so they are the same across runs.
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from dataclasses import make_dataclass
+from timeit import repeat
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Generic
+from typing import List
+from typing import NewType
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+
+import typedjson
+
+T1 = TypeVar("T1")
+T2 = TypeVar("T2")
+
+UserId = NewType("UserId", str)
+Score = NewType("Score", float)
+
+
+@dataclass(frozen=True)
+class NameJson:
+    first: str
+    last: Optional[str]
+
+
+@dataclass(frozen=True)
+class UserJson:
+    id: UserId
+    age: int
+    score: Score
+    name: NameJson
+    tags: List[str]
+
+
+@dataclass(frozen=True)
+class CatJson:
+    kind: str
+    lives: int
+
+
+@dataclass(frozen=True)
+class DogJson:
+    kind: str
+    breed: Optional[str]
+    tricks: List[str]
+
+
+@dataclass(frozen=True)
+class PetJson:
+    owner: Optional[NameJson]
+    pet: Union[CatJson, DogJson, None]
+    rating: Optional[Union[int, str]]
+
+
+# Fields of generic classes are type variables to be parameterized.
+@dataclass(frozen=True)
+class PairJson(Generic[T1, T2]):
+    first: T1
+    second: T2
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    type_: Any
+    json: Any
+
+
+def _name(r: random.Random) -> Dict[str, Any]:
+    return {"first": f"first-{r.randrange(1000)}", "last": r.choice([None, "last"])}
+
+
+def _user(r: random.Random) -> Dict[str, Any]:
+    return {
+        "id": f"user-{r.randrange(1 << 30)}",
+        "age": r.randrange(100),
+        "score": r.random(),
+        "name": _name(r),
+        "tags": [f"tag-{r.randrange(100)}" for _ in range(r.randrange(5))],
+    }
+
+
+def _wide(r: random.Random, scale: int) -> Case:
+    # A class with many fields of primitive types.
+    types = [str, int, float, bool, Optional[str]]
+    fields = [(f"field{i}", types[i % len(types)]) for i in range(100)]
+    type_ = make_dataclass("WideJson", fields, frozen=True)
+
+    values: List[Callable[[], Any]] = [
+        lambda: f"value-{r.randrange(1000)}",
+        lambda: r.randrange(1 << 20),
+        lambda: r.random(),
+        lambda: r.random() < 0.5,
+        lambda: r.choice([None, "value"]),
+    ]
+    item = {f"field{i}": values[i % len(values)]() for i in range(len(fields))}
+    return Case("wide", List[type_], [item] * (100 * scale))  # type: ignore
+
+
+def _deep(r: random.Random, scale: int) -> Case:
+    # Classes nested in each other 30 levels deep.
+    type_: Any = NameJson
+    json_: Any = _name(r)
+    for i in range(30):
+        type_ = make_dataclass(
+            f"DeepJson{i}", [("id", int), ("child", type_)], frozen=True
+        )
+        json_ = {"id": i, "child": json_}
+
+    return Case("deep", List[type_], [json_] * (100 * scale))
+
+
+def _list(r: random.Random, scale: int) -> Case:
+    return Case("list", List[UserJson], [_user(r) for _ in range(10000 * scale)])
+
+
+def _union(r: random.Random, scale: int) -> Case:
+    pets = [
+        {"kind": "cat", "lives": 9},
+        {"kind": "dog", "breed": None, "tricks": ["sit", "paw"]},
+        None,
+    ]
+    ratings = [None, 5, "five"]
+    jsons = [
+        {
+            "owner": r.choice([None, _name(r)]),
+            "pet": r.choice(pets),
+            "rating": r.choice(ratings),
+        }
+        for _ in range(5000 * scale)
+    ]
+    return Case("union", List[PetJson], jsons)
+
+
+def _generic(r: random.Random, scale: int) -> Case:
+    pairs = [
+        {"first": _user(r), "second": r.choice([None, _name(r)])}
+        for _ in range(5000 * scale)
+    ]
+    type_ = List[PairJson[UserJson, Optional[NameJson]]]
+    return Case("generic", type_, pairs)
+
+
+_generators = {
+    "wide": _wide,
+    "deep": _deep,
+    "list": _list,
+    "union": _union,
+    "generic": _generic,
+}
+
+
+def _operations_of(case: Case) -> List[Tuple[str, Callable[[], Any]]]:
+    text = json.dumps(case.json)
+    decoded = typedjson.decode(case.type_, case.json)
+    assert not isinstance(decoded, typedjson.DecodingError), decoded
+
+    return [
+        ("decode", lambda: typedjson.decode(case.type_, case.json)),
+        (
+            "decode_codegen",
+            lambda: typedjson.decode(case.type_, case.json, codegen=True),
+        ),
+        ("loads", lambda: typedjson.loads(case.type_, text)),
+        ("dumps", lambda: typedjson.dumps(decoded)),
+        ("dumps_typed", lambda: typedjson.dumps(decoded, type_=case.type_)),
+    ]
+
+
+def _peak_of(function: Callable[[], Any]) -> int:
+    # Memory allocated by an operation including its result at the peak.
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(names: Sequence[str], scale: int, repeats: int) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    for name in names:
+        case = _generators[name](random.Random(0), scale)
+        size = len(json.dumps(case.json).encode())
+        for operation, function in _operations_of(case):
+            function()  # Compile decoders and encoders before measuring.
+            seconds = min(repeat(function, number=1, repeat=repeats))
+            results.append(
+                {
+                    "case": name,
+                    "operation": operation,
+                    "seconds": seconds,
+                    "bytes": size,
+                    "megabytes_per_second": size / seconds / 1e6,
+                    "peak_bytes": _peak_of(function),
+                }
+            )
+            print(
+                f"{name:<8} {operation:<16} {seconds * 1e3:9.2f} ms"
+                f" {size / seconds / 1e6:8.2f} MB/s"
+                f" {results[-1]['peak_bytes'] / 1e6:8.2f} MB peak",
+                file=sys.stderr,
+            )
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "typedjson": _version(),
+        "scale": scale,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def _version() -> Optional[str]:
+    try:
+        from importlib.metadata import version
+
+        return version("typedjson")
+    except Exception:
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run benchmarks of typedjson.")
+    parser.add_argument("--case", action="append", choices=sorted(_generators))
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=argparse.FileType("w"), default=sys.stdout)
+    args = parser.parse_args()
+
+    report = run(args.case or list(_generators), args.scale, args.repeat)
+    json.dump(report, args.output, indent=2)
+    args.output.write("\n")
+
+
+if __name__ == "__main__":
+    main()
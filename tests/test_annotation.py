@@ -2,12 +2,15 @@
 
 from typing import Generic
 from typing import List
+from typing import NamedTuple
 from typing import NewType
 from typing import Tuple
 from typing import Type
 from typing import TypeVar
 
 from typedjson.annotation import args_of
+from typedjson.annotation import clear_hints
+from typedjson.annotation import hints_of
 from typedjson.annotation import origin_of
 from typedjson.annotation import parameters_of
 from typedjson.annotation import supertype_of
@@ -32,6 +35,11 @@ class GenericJson(Generic[T1, T2]):
     t2: T2
 
 
+class PointJson(NamedTuple):
+    label: str
+    name: NameJson
+
+
 def test_can_obtain_args_of_generics() -> None:
     expectation = (int, str)
     assert args_of(GenericJson[int, str]) == expectation
@@ -42,6 +50,32 @@ def test_can_obtain_parameters_of_generics() -> None:
     assert parameters_of(GenericJson[int, str]) == expectation
 
 
+def test_can_obtain_hints_of_class() -> None:
+    expectation = {"first": str, "last": str}
+    assert hints_of(NameJson) == expectation
+
+
+def test_can_obtain_hints_of_generics() -> None:
+    expectation = {"t1": int, "t2": str}
+    assert hints_of(GenericJson[int, str]) == expectation
+
+
+def test_can_obtain_hints_of_named_tuple() -> None:
+    expectation = {"label": str, "name": NameJson}
+    assert hints_of(PointJson) == expectation
+
+
+def test_can_reuse_hints() -> None:
+    assert hints_of(GenericJson[int, str]) is hints_of(GenericJson[int, str])
+
+
+def test_can_clear_hints() -> None:
+    hints = hints_of(NameJson)
+    clear_hints()
+    assert hints_of(NameJson) is not hints
+    assert hints_of(NameJson) == hints
+
+
 def test_can_obtain_origin_of_generics() -> None:
     expectation = GenericJson
     assert origin_of(GenericJson[int, str]) == expectation
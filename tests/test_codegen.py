@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+from typing import Any
+from typing import Dict
+from typing import Generic
+from typing import List
+from typing import Optional
+from typing import TypeVar
+
+import typedjson
+from typedjson import DecodingError
+from typedjson import TypeMismatch
+from typedjson import UnsupportedDecoding
+from typedjson.codegen import generate_decoder
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class NameJson:
+    first: str
+    last: Optional[str]
+
+
+@dataclass(frozen=True)
+class UserJson:
+    id: str
+    age: int
+    score: float
+    name: NameJson
+    friends: List[NameJson]
+
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class GenericJson(Generic[T]):
+    t: T
+
+
+@dataclass(frozen=True)
+class NodeJson:
+    label: str
+    children: List["NodeJson"]
+
+
+json_user: Dict[str, Any] = {
+    "id": "test-user",
+    "age": 28,
+    "score": 1,
+    "name": {"first": "Tomoya", "last": "Kose"},
+    "friends": [{"first": "Jiji"}],
+}
+
+expectation_user = UserJson(
+    id="test-user",
+    age=28,
+    score=1.0,
+    name=NameJson(first="Tomoya", last="Kose"),
+    friends=[NameJson(first="Jiji", last=None)],
+)
+
+
+def test_can_decode_dataclass() -> None:
+    assert typedjson.decode(UserJson, json_user, codegen=True) == expectation_user
+
+
+def test_can_decode_list_of_dataclass() -> None:
+    json = [json_user, json_user]
+    expectation = [expectation_user, expectation_user]
+    assert typedjson.decode(List[UserJson], json, codegen=True) == expectation
+
+
+def test_can_decode_parameterized_dataclass() -> None:
+    json = {"t": 100}
+    expectation = GenericJson(t=100)
+    assert typedjson.decode(GenericJson[int], json, codegen=True) == expectation
+
+
+def test_can_decode_recursive_dataclass() -> None:
+    json = {"label": "root", "children": [{"label": "leaf", "children": []}]}
+    expectation = NodeJson(label="root", children=[NodeJson(label="leaf", children=[])])
+    assert typedjson.decode(NodeJson, json, codegen=True) == expectation
+
+
+def test_can_decode_non_class() -> None:
+    assert typedjson.decode(Optional[int], None, codegen=True) is None
+
+
+def test_can_reuse_generated_decoder() -> None:
+    assert generate_decoder(UserJson) is generate_decoder(UserJson)
+
+
+def test_cannot_decode_dataclass_with_incompatible() -> None:
+    json = {**json_user, "friends": [{"first": "Jiji"}, {"first": 13}]}
+    expectation = DecodingError(TypeMismatch(("friends", "1", "first")))
+    assert typedjson.decode(UserJson, json, codegen=True) == expectation
+
+
+def test_cannot_decode_dataclass_with_lack_of_property() -> None:
+    json = {**json_user, "name": {"last": "Kose"}}
+    expectation = DecodingError(TypeMismatch(("name", "first")))
+    assert typedjson.decode(UserJson, json, codegen=True) == expectation
+
+
+def test_cannot_decode_raw_dataclass() -> None:
+    json = {"t": 100}
+    expectation = DecodingError(UnsupportedDecoding(()))
+    assert typedjson.decode(GenericJson, json, codegen=True) == expectation
+
+
+def test_cannot_decode_non_object_as_dataclass() -> None:
+    expectation = DecodingError(UnsupportedDecoding(()))
+    assert typedjson.decode(UserJson, [], codegen=True) == expectation
@@ -1,22 +1,56 @@
 #!/usr/bin/env python3
 
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timezone
+from decimal import Decimal
+from enum import Enum
+from enum import IntEnum
+from subprocess import PIPE
+from subprocess import run
 from typing import Any
+from typing import Dict
 from typing import Generic
 from typing import List
+from typing import Mapping
+from typing import NamedTuple
 from typing import Optional
 from typing import NewType
 from typing import Tuple
 from typing import TypeVar
 from typing import Union
+from uuid import UUID
+import sys
+
+from typing_extensions import Annotated
+from typing_extensions import Literal
+
+import pytest
 
 import typedjson
 from typedjson import DecodingError
+from typedjson import Discriminator
 from typedjson import TypeMismatch
 from typedjson import UnsupportedDecoding
 from dataclasses import dataclass
 
 A = NewType("A", str)
 
+# Strings in `Annotated` are named, as pyflakes reads them as forward references.
+META = "meta"
+AGE = "age"
+KIND = "kind"
+NAME = "name"
+VERSION = "version"
+INT8 = "b"
+INT64 = "q"
+FLOAT64 = "d"
+UNICODE = "u"
+UNKNOWN = "z"
+FLOAT32 = "float32"
+INT32 = "int32"
+
 
 @dataclass(frozen=True)
 class NameJson:
@@ -54,6 +88,42 @@ class GenericJson(Generic[T1, T2]):
     t2: T2
 
 
+@dataclass(frozen=True)
+class TreeJson:
+    label: str
+    children: List["TreeJson"]
+
+
+@dataclass(frozen=True)
+class CatEventJson:
+    kind: Literal["cat"]
+    version: Literal[1]
+    name: NameJson
+
+
+@dataclass(frozen=True)
+class DogEventJson:
+    kind: Literal["dog", "puppy"]
+    version: Literal[1]
+    age: int
+
+
+# Aliases of `Union` passed as values are rejected by mypy unless typed as `Any`.
+EventJson: Any = Union[CatEventJson, DogEventJson]
+
+
+class PointJson(NamedTuple):
+    label: str
+    name: Optional[NameJson] = None
+
+
+@typedjson.slotted
+@dataclass(frozen=True)
+class SlottedNameJson:
+    first: str
+    last: str
+
+
 def test_can_decode_str() -> None:
     json = "string"
     assert typedjson.decode(str, json) == json
@@ -214,6 +284,60 @@ def test_can_decode_union() -> None:
     )
 
 
+def test_can_decode_recursive_dataclass() -> None:
+    json = {"label": "root", "children": [{"label": "leaf", "children": []}]}
+    expectation = TreeJson(label="root", children=[TreeJson(label="leaf", children=[])])
+    assert typedjson.decode(TreeJson, json) == expectation
+
+
+def test_can_decode_many() -> None:
+    jsons = [
+        {"first": "Tomoya", "last": "Kose"},
+        {"first": "Jiji"},
+        {"first": "Gin", "last": "Mitsuse"},
+    ]
+
+    expectation = [
+        NameJson(first="Tomoya", last="Kose"),
+        DecodingError(TypeMismatch(("1", "last"))),
+        NameJson(first="Gin", last="Mitsuse"),
+    ]
+
+    assert typedjson.decode_many(NameJson, jsons) == expectation
+    assert typedjson.decode_many(NameJson, jsons, codegen=True) == expectation
+
+
+def test_can_decode_many_in_parallel() -> None:
+    jsons: List[Any] = [{"first": "Tomoya", "last": str(i)} for i in range(300)]
+    jsons[200] = {"first": "Jiji"}
+
+    expectation = typedjson.decode_many(NameJson, jsons)
+
+    assert expectation[200] == DecodingError(TypeMismatch(("200", "last")))
+    assert typedjson.decode_many(NameJson, jsons, workers=2) == expectation
+    assert typedjson.decode_many(NameJson, jsons, codegen=True, workers=2) == (
+        expectation
+    )
+
+
+def test_can_compile_decoder() -> None:
+    json = {"id": "test-user", "age": 28, "name": {"first": "Tomoya", "last": "Kose"}}
+
+    expectation = UserJson(
+        id="test-user", age=28, name=NameJson(first="Tomoya", last="Kose")
+    )
+
+    decoder = typedjson.compile_decoder(UserJson)
+    assert decoder(json, ()) == expectation
+    assert decoder({"id": "test-user"}, ()) == DecodingError(TypeMismatch(("age",)))
+
+
+def test_can_reuse_compiled_decoder() -> None:
+    assert typedjson.compile_decoder(List[UserJson]) is typedjson.compile_decoder(
+        List[UserJson]
+    )
+
+
 def test_cannot_decode_with_wrong_type() -> None:
     json = True
     assert typedjson.decode(str, json) == DecodingError(TypeMismatch(()))
@@ -229,6 +353,23 @@ def test_cannot_decode_none() -> None:
     assert typedjson.decode(str, json) == DecodingError(TypeMismatch(()))
 
 
+def test_cannot_decode_object_as_primitive() -> None:
+    json: Any = {}
+    assert typedjson.decode(str, json) == DecodingError(TypeMismatch(()))
+    assert typedjson.decode(int, json) == DecodingError(TypeMismatch(()))
+    assert typedjson.decode(A, json) == DecodingError(TypeMismatch(()))
+    assert typedjson.decode(Union[None, NameJson], json) == DecodingError(
+        TypeMismatch(("first",))
+    )
+
+
+def test_cannot_decode_optional_with_wrong_object() -> None:
+    json = {"id": "d", "content": "c", "owner": {"id": "o", "name": {}}}
+    expectation = DecodingError(TypeMismatch(("owner",)))
+    assert typedjson.decode(DocumentJson, json) == expectation
+    assert typedjson.decode(DocumentJson, json, codegen=True) == expectation
+
+
 def test_cannote_decode_tuple_with_incompatible() -> None:
     json = (0, 1, 2, 3)
     expectation = DecodingError(TypeMismatch(("1",)))
@@ -292,6 +433,17 @@ def test_cannot_decode_dataclass_with_lack_of_property() -> None:
     assert typedjson.decode(UserJson, json) == expectation
 
 
+def test_cannot_decode_list_of_dataclass_with_lack_of_property() -> None:
+    json = [
+        {"id": "test-user", "age": 28, "name": {"first": "Tomoya", "last": "Kose"}},
+        {"id": "test-user", "age": 28, "name": {"last": "Kose"}},
+    ]
+
+    expectation = DecodingError(TypeMismatch(("1", "name", "first")))
+
+    assert typedjson.decode(List[UserJson], json) == expectation
+
+
 def test_cannot_decode_parameterized_dataclass_with_wrong_parameter() -> None:
     json = {"t1": 100, "t2": "hello"}
     expectation = DecodingError(TypeMismatch(("t2",)))
@@ -310,3 +462,372 @@ def test_cannot_decode_generic_dataclass() -> None:
     json = {"t1": 100, "t2": "hello"}
     expectation = DecodingError(UnsupportedDecoding(()))
     assert typedjson.decode(GenericJson[U1, U2], json) == expectation
+
+
+def test_can_decode_literal() -> None:
+    assert typedjson.decode(Literal["cat", 1], "cat") == "cat"
+    assert typedjson.decode(Literal["cat", 1], 1) == 1
+
+
+def test_cannot_decode_literal_with_wrong_value() -> None:
+    expectation = DecodingError(TypeMismatch(()))
+    assert typedjson.decode(Literal["cat", 1], "dog") == expectation
+    assert typedjson.decode(Literal["cat", 1], True) == expectation
+
+
+def test_can_decode_annotated() -> None:
+    assert typedjson.decode(Annotated[List[int], META], [1, 2]) == [1, 2]
+
+
+def test_can_decode_tagged_union() -> None:
+    cat = {"kind": "cat", "version": 1, "name": {"first": "Jiji", "last": "Kiki"}}
+    dog = {"kind": "puppy", "version": 1, "age": 1}
+
+    assert typedjson.decode(EventJson, cat) == CatEventJson(
+        kind="cat", version=1, name=NameJson(first="Jiji", last="Kiki")
+    )
+    assert typedjson.decode(EventJson, dog) == DogEventJson(
+        kind="puppy", version=1, age=1
+    )
+    assert typedjson.decode(Optional[EventJson], None) is None
+
+
+def test_cannot_decode_tagged_union_with_wrong_member() -> None:
+    json = {"kind": "cat", "version": 1, "name": {"first": "Jiji"}}
+    expectation = DecodingError(TypeMismatch(("name", "last")))
+    assert typedjson.decode(EventJson, json) == expectation
+
+
+def test_cannot_decode_tagged_union_with_unknown_tag() -> None:
+    json = {"kind": "bird", "version": 1, "age": 1}
+    expectation = DecodingError(TypeMismatch(("kind",)))
+    assert typedjson.decode(EventJson, json) == expectation
+
+
+def test_can_decode_tagged_union_with_discriminator() -> None:
+    json = {"kind": "cat", "version": 1, "name": {"first": "Jiji"}}
+    expectation = DecodingError(TypeMismatch(("name", "last")))
+
+    type_: Any = Annotated[EventJson, Discriminator(KIND)]
+    assert typedjson.decode(type_, json) == expectation
+
+
+def test_cannot_compile_discriminator_without_literal() -> None:
+    type_: Any = Annotated[EventJson, Discriminator(NAME)]
+    with pytest.raises(ValueError) as error:
+        typedjson.decode(type_, {})
+    assert str(error.value) == f"{CatEventJson} has no field 'name' of Literal"
+
+    type_ = Annotated[EventJson, Discriminator(AGE)]
+    with pytest.raises(ValueError) as error:
+        typedjson.decode(type_, {})
+    assert str(error.value) == f"{CatEventJson} has no field 'age' of Literal"
+
+    type_ = Annotated[EventJson, Discriminator(VERSION)]
+    with pytest.raises(ValueError) as error:
+        typedjson.decode(type_, {})
+    assert str(error.value) == f"{DogEventJson} shares values of 'version' with others"
+
+
+def test_can_decode_union_by_kind_of_json() -> None:
+    type_: Any = Union[Optional[NameJson], int, List[int], str]
+    assert typedjson.decode(type_, [1]) == [1]
+    assert typedjson.decode(type_, "foo") == "foo"
+    assert typedjson.decode(type_, None) is None
+    assert typedjson.decode(type_, {"first": "Jiji", "last": "Kiki"}) == NameJson(
+        first="Jiji", last="Kiki"
+    )
+
+
+def test_cannot_decode_union_with_lack_of_property() -> None:
+    json = {"id": "test-document", "age": 28}
+    expectation = DecodingError(TypeMismatch(("content",)))
+    assert typedjson.decode(Union[UserJson, DocumentJson], json) == expectation
+
+
+def test_can_decode_union_in_order_of_members() -> None:
+    assert type(typedjson.decode(Union[int, float], 1)) is int
+    assert type(typedjson.decode(Union[float, int], 1)) is float
+
+
+def test_can_decode_dict() -> None:
+    json = {"jiji": {"first": "Jiji", "last": "Kiki"}}
+    expectation = {"jiji": NameJson(first="Jiji", last="Kiki")}
+    assert typedjson.decode(Dict[str, NameJson], json) == expectation
+    type_: Any = Mapping[A, NameJson]
+    assert typedjson.decode(type_, json) == expectation
+
+
+def test_can_decode_dict_of_primitive_without_copy() -> None:
+    json = {"jiji": 13, "gin": None}
+    type_ = Dict[str, Optional[int]]
+    assert typedjson.decode(type_, json, reuse_input=True) is json
+    assert typedjson.decode(type_, json) is not json
+    assert typedjson.decode(type_, json) == json
+    assert typedjson.decode(Dict[str, float], {"jiji": 13}) == {"jiji": 13.0}
+
+
+def test_cannot_decode_dict_with_wrong_value() -> None:
+    json = {"jiji": 13, "gin": "2"}
+    expectation = DecodingError(TypeMismatch(("gin",)))
+    assert typedjson.decode(Dict[str, int], json) == expectation
+    assert typedjson.decode(Dict[str, int], json, codegen=True) == expectation
+
+    nested = {"jiji": [1, 2], "gin": [3, "4"]}
+    expectation = DecodingError(TypeMismatch(("gin", "1")))
+    assert typedjson.decode(Dict[str, List[int]], nested) == expectation
+
+
+def test_cannot_decode_dict_with_non_str_key() -> None:
+    expectation = DecodingError(UnsupportedDecoding(()))
+    assert typedjson.decode(Dict[int, int], {"1": 1}) == expectation
+
+
+def test_can_decode_list_of_primitive_without_copy() -> None:
+    json = [1, 2, True]
+    assert typedjson.decode(List[int], json, reuse_input=True) is json
+    assert typedjson.decode(List[int], json, codegen=True, reuse_input=True) is json
+    assert typedjson.decode(List[int], json) is not json
+    assert typedjson.decode(List[int], json) == json
+    assert typedjson.decode(List[float], [1, 2.5], reuse_input=True) == [1.0, 2.5]
+    assert typedjson.decode(Tuple[int, ...], json, reuse_input=True) == (1, 2, True)
+
+
+def test_can_decode_array() -> None:
+    from array import array
+
+    type_: Any = Annotated[List[float], typedjson.Array()]
+    assert typedjson.decode(type_, [1, 2.5]) == array("d", [1.0, 2.5])
+
+    type_ = Annotated[List[int], typedjson.Array(INT8)]
+    assert typedjson.decode(type_, [1, True]) == array("b", [1, 1])
+
+
+def test_cannot_decode_array_with_wrong_element() -> None:
+    type_: Any = Annotated[List[int], typedjson.Array(INT8)]
+    assert typedjson.decode(type_, [1, "2"]) == DecodingError(TypeMismatch(("1",)))
+    assert typedjson.decode(type_, [1, 1000]) == DecodingError(TypeMismatch(()))
+
+
+def test_can_decode_numpy_array() -> None:
+    numpy = pytest.importorskip("numpy")
+
+    type_: Any = Annotated[List[float], typedjson.NumpyArray(FLOAT32)]
+    decoded = typedjson.decode(type_, [1, 2.5])
+    assert decoded.dtype == numpy.float32  # type: ignore
+    assert decoded.tolist() == [1.0, 2.5]  # type: ignore
+
+
+def test_cannot_compile_array_of_wrong_typecode() -> None:
+    from array import array
+
+    for typecode in [INT64, UNICODE, UNKNOWN]:
+        type_: Any = Annotated[List[float], typedjson.Array(typecode)]
+        with pytest.raises(ValueError) as error:
+            typedjson.decode(type_, [1.5])
+        assert (
+            str(error.value)
+            == f"Array({typecode!r}) cannot hold elements of {List[float]}"
+        )
+
+    type_ = Annotated[List[int], typedjson.Array(FLOAT64)]
+    assert typedjson.decode(type_, [1, 2]) == array(FLOAT64, [1.0, 2.0])
+
+
+def test_cannot_compile_numpy_array_of_wrong_dtype() -> None:
+    pytest.importorskip("numpy")
+
+    for dtype in [INT32, UNKNOWN]:
+        type_: Any = Annotated[List[float], typedjson.NumpyArray(dtype)]
+        with pytest.raises(ValueError):
+            typedjson.decode(type_, [1.5])
+
+
+def test_can_decode_named_tuple() -> None:
+    name = {"first": "Jiji", "last": "Kiki"}
+    expectation = PointJson(label="jiji", name=NameJson(first="Jiji", last="Kiki"))
+    assert typedjson.decode(PointJson, {"label": "jiji", "name": name}) == expectation
+    assert typedjson.decode(PointJson, ["jiji", name]) == expectation
+    assert typedjson.decode(PointJson, ["jiji", name], codegen=True) == expectation
+    assert typedjson.decode(Union[int, PointJson], ["jiji", None]) == PointJson("jiji")
+
+
+def test_cannot_decode_named_tuple_with_wrong_length() -> None:
+    expectation = DecodingError(TypeMismatch(()))
+    assert typedjson.decode(PointJson, ["jiji"]) == expectation
+    assert typedjson.decode(PointJson, ["jiji", None, None]) == expectation
+
+
+def test_can_decode_slotted_dataclass() -> None:
+    json = {"first": "Jiji", "last": "Kiki"}
+    decoded = typedjson.decode(SlottedNameJson, json)
+    assert decoded == SlottedNameJson(first="Jiji", last="Kiki")
+    assert not hasattr(decoded, "__dict__")
+
+
+def test_can_collect_errors() -> None:
+    json = {"id": 1, "age": 28, "name": {"first": None, "last": 2}}
+    expectation = DecodingError(
+        TypeMismatch(("id",)),
+        [
+            TypeMismatch(("id",)),
+            TypeMismatch(("name", "first")),
+            TypeMismatch(("name", "last")),
+        ],
+    )
+    assert typedjson.decode(UserJson, json, max_errors=10) == expectation
+    assert typedjson.decode(UserJson, json, max_errors=10, codegen=True) == expectation
+    assert typedjson.decode(UserJson, json) == DecodingError(TypeMismatch(("id",)))
+
+
+def test_can_collect_errors_up_to_max_errors() -> None:
+    json = [1, "2", 3, "4", "5"]
+    expectation = DecodingError(
+        TypeMismatch(("1",)), [TypeMismatch(("1",)), TypeMismatch(("3",))]
+    )
+    assert typedjson.decode(List[int], json, max_errors=2) == expectation
+    assert typedjson.decode_many(List[int], [json], max_errors=2) == [
+        DecodingError(
+            TypeMismatch(("0", "1")),
+            [TypeMismatch(("0", "1")), TypeMismatch(("0", "3"))],
+        )
+    ]
+
+
+def test_can_collect_errors_with_same_reason() -> None:
+    cases: List[Tuple[Any, Any]] = [
+        (OwnerJson, {"id": "o", "name": {"first": 1, "last": None}}),
+        (List[NameJson], [1]),
+        (List[int], [1, "2", 3, "4"]),
+    ]
+    for type_, json in cases:
+        error = typedjson.decode(type_, json)
+        assert isinstance(error, DecodingError)
+
+        collected = typedjson.decode(type_, json, max_errors=2)
+        assert isinstance(collected, DecodingError)
+        assert collected.reason == error.reason
+
+
+def test_can_decode_as_kinds_of_types() -> None:
+    from typedjson.decoding import decode_as_class
+    from typedjson.decoding import decode_as_list
+
+    json = {"first": "Jiji", "last": "Kiki"}
+    expectation = NameJson(first="Jiji", last="Kiki")
+    assert decode_as_class(NameJson, json, ()) == expectation
+    assert decode_as_list(List[NameJson], [json], ()) == [expectation]
+    assert decode_as_list(List[NameJson], [1], ()) == typedjson.decode(
+        List[NameJson], [1]
+    )
+    assert decode_as_list(NameJson, json, ()) == DecodingError(UnsupportedDecoding(()))
+
+
+@dataclass(frozen=True)
+class PaymentJson:
+    id: UUID
+    paid_at: datetime
+    due: Optional[date]
+    amount: Decimal
+
+
+def test_can_decode_stdlib_types() -> None:
+    json = {
+        "id": "12345678-1234-5678-1234-567812345678",
+        "paid_at": "2020-01-02T03:04:05+00:00",
+        "due": "2020-02-01",
+        "amount": 0.1,
+    }
+    expectation = PaymentJson(
+        id=UUID("12345678-1234-5678-1234-567812345678"),
+        paid_at=datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        due=date(2020, 2, 1),
+        amount=Decimal("0.1"),
+    )
+    assert typedjson.decode(PaymentJson, json) == expectation
+    assert typedjson.decode(PaymentJson, json, codegen=True) == expectation
+
+
+def test_can_decode_datetime_in_utc() -> None:
+    utc = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert typedjson.decode(datetime, "2020-01-02T03:04:05Z") == utc
+    assert typedjson.decode(datetime, "2020-01-02T03:04:05.000Z") == utc
+    assert typedjson.decode(time, "03:04:05Z") == time(3, 4, 5, tzinfo=timezone.utc)
+
+
+def test_cannot_decode_stdlib_types_with_wrong_value() -> None:
+    assert typedjson.decode(datetime, 1) == DecodingError(TypeMismatch(()))
+    assert typedjson.decode(date, "2020-13-01") == DecodingError(TypeMismatch(()))
+    assert typedjson.decode(Decimal, "one") == DecodingError(TypeMismatch(()))
+    assert typedjson.decode(Decimal, True) == DecodingError(TypeMismatch(()))
+    assert typedjson.decode(UUID, "1234") == DecodingError(TypeMismatch(()))
+
+
+def test_can_import_without_modules_of_stdlib_types() -> None:
+    # The modules are loaded in a new interpreter, as pytest has loaded them here.
+    modules = ["datetime", "decimal", "uuid", "typedjson.profiling", "typedjson.record"]
+    code = f"import sys, typedjson; print(sorted(set(sys.modules) & set({modules})))"
+    process = run([sys.executable, "-c", code], stdout=PIPE, check=True)
+    assert process.stdout.decode().strip() == "[]"
+
+
+def test_can_register_decoder() -> None:
+    @dataclass(frozen=True)
+    class CentsJson:
+        value: int
+
+    def decode_cents(json: Any) -> CentsJson:
+        if json.__class__ is not str or not json.endswith("c"):
+            raise ValueError(json)
+
+        return CentsJson(int(json[:-1]))
+
+    assert typedjson.decode(List[CentsJson], [{"value": 1}]) == [CentsJson(1)]
+
+    typedjson.register_decoder(CentsJson, decode_cents)
+    assert typedjson.decode(List[CentsJson], ["1c", "2c"]) == [
+        CentsJson(1),
+        CentsJson(2),
+    ]
+    assert typedjson.decode(Union[int, CentsJson], "3c") == CentsJson(3)
+    assert typedjson.decode(List[CentsJson], ["1c", {"value": 1}]) == DecodingError(
+        TypeMismatch(("1",))
+    )
+
+
+def test_cannot_register_decoder_for_primitive() -> None:
+    with pytest.raises(ValueError):
+        typedjson.register_decoder(int, int)
+
+
+class ColorJson(Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+class LevelJson(IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+def test_can_decode_enum() -> None:
+    assert typedjson.decode(ColorJson, "red") is ColorJson.RED
+    assert typedjson.decode(LevelJson, 2) is LevelJson.HIGH
+    assert typedjson.decode(List[Optional[ColorJson]], ["green", None]) == [
+        ColorJson.GREEN,
+        None,
+    ]
+
+
+def test_cannot_decode_enum_with_wrong_value() -> None:
+    expectation = DecodingError(TypeMismatch(()))
+    assert typedjson.decode(ColorJson, "blue") == expectation
+    assert typedjson.decode(ColorJson, ["red"]) == expectation
+    assert typedjson.decode(LevelJson, True) == expectation
+
+
+def test_can_decode_literal_of_enum() -> None:
+    type_: Any = Literal[ColorJson.GREEN, "red"]
+    assert typedjson.decode(type_, "green") is ColorJson.GREEN
+    assert typedjson.decode(type_, "red") == "red"
+    assert typedjson.decode(type_, "blue") == DecodingError(TypeMismatch(()))
@@ -1,14 +1,31 @@
 #!/usr/bin/env python3
 
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
 from typing import Optional
 from typing import NewType
+from typing import Union
+from uuid import UUID
+
+from typing_extensions import Annotated
+from typing_extensions import Literal
+
+import pytest
 
 import typedjson
 from dataclasses import dataclass
 
-
 A = NewType("A", str)
 
+# Strings in `Annotated` are named, as pyflakes reads them as forward references.
+META = "meta"
+
 
 @dataclass(frozen=True)
 class NameJson:
@@ -23,6 +40,30 @@ class CatJson:
     name: NameJson
 
 
+@dataclass(frozen=True)
+class CatEventJson:
+    kind: Literal["cat"]
+    names: Annotated[List[NameJson], META]
+
+
+@dataclass(frozen=True)
+class SeriesJson:
+    values: Annotated[List[float], typedjson.Array()]
+
+
+class SlottedNameJson:
+    __slots__ = ("first", "last")
+
+    def __init__(self, first: str, last: Optional[str]) -> None:
+        self.first = first
+        self.last = last
+
+
+class PointJson(NamedTuple):
+    label: str
+    name: NameJson
+
+
 data = CatJson(id="test-cat", age=13, name=NameJson(first="jiji", last=None))
 
 expectation = """{
@@ -156,3 +197,190 @@ def test_dumps_list_of_name() -> None:
     )
 
     assert typedjson.dumps(names, indent=2) == expectation
+
+
+def test_dumps_with_type() -> None:
+    assert typedjson.dumps(data, indent=2, type_=CatJson) == expectation
+
+
+def test_dumps_list_with_type() -> None:
+    assert typedjson.dumps([data], indent=2, type_=List[CatJson]) == expectation_seq
+
+
+def test_dump_with_type() -> None:
+    import io
+
+    output = io.StringIO("")
+    typedjson.dump(data, output, indent=2, type_=CatJson)
+    assert output.getvalue() == expectation
+
+
+def test_dumps_slotted_class() -> None:
+    name = SlottedNameJson(first="jiji", last=None)
+    expectation = '{"first": "jiji", "last": null}'
+    assert typedjson.dumps(name) == expectation
+    assert typedjson.dumps(name, type_=SlottedNameJson) == expectation
+
+
+def test_compile_encoder_without_copy() -> None:
+    values = [1, 2, 3]
+    assert typedjson.compile_encoder(List[int])(values) is values
+
+
+def test_dumps_iter() -> None:
+    chunks = list(typedjson.dumps_iter((data,), indent=2))
+    assert len(chunks) > 1
+    assert "".join(chunks) == expectation_seq
+
+
+def test_dumps_iter_before_converting_rest() -> None:
+    class CatsJson(List[CatJson]):
+        def __iter__(self) -> Iterator[CatJson]:
+            yield data
+            raise RuntimeError("The second cat is reached")
+
+    for type_ in (None, List[CatJson]):
+        chunks: List[str] = []
+        with pytest.raises(RuntimeError):
+            for chunk in typedjson.dumps_iter(CatsJson(), type_=type_):
+                chunks.append(chunk)
+
+        assert "".join(chunks) == '[{"id": "test-cat", "age": 13, "name": ' + (
+            '{"first": "jiji", "last": null}}'
+        )
+
+
+def test_dumps_iter_with_type() -> None:
+    chunks = typedjson.dumps_iter([data], indent=2, type_=List[CatJson])
+    assert "".join(chunks) == expectation_seq
+
+
+def test_dumps_dict_of_dataclass() -> None:
+    expectation = '{"jiji": {"first": "jiji", "last": null}}'
+    assert typedjson.dumps({"jiji": data.name}) == expectation
+
+
+def test_dumps_literal_and_annotated_with_type() -> None:
+    event = CatEventJson(kind="cat", names=[data.name])
+    expectation = '{"kind": "cat", "names": [{"first": "jiji", "last": null}]}'
+    assert typedjson.dumps(event, type_=CatEventJson) == expectation
+    assert typedjson.compile_encoder(CatEventJson)(event) == {
+        "kind": "cat",
+        "names": [{"first": "jiji", "last": None}],
+    }
+
+
+def test_dumps_dict_with_type() -> None:
+    expectation = '{"jiji": {"first": "jiji", "last": null}}'
+    type_ = Dict[str, NameJson]
+    assert typedjson.dumps({"jiji": data.name}, type_=type_) == expectation
+    assert typedjson.compile_encoder(Dict[str, NameJson])({"jiji": data.name}) == {
+        "jiji": {"first": "jiji", "last": None}
+    }
+
+
+def test_dumps_array() -> None:
+    from array import array
+
+    series = SeriesJson(values=array("d", [1.0, 2.5]))  # type: ignore
+    expectation = '{"values": [1.0, 2.5]}'
+    assert typedjson.dumps(series) == expectation
+    assert typedjson.dumps(series, type_=SeriesJson) == expectation
+    assert typedjson.compile_encoder(SeriesJson)(series) == {"values": [1.0, 2.5]}
+
+
+def test_dumps_named_tuple() -> None:
+    point = PointJson(label="jiji", name=data.name)
+    expectation = '{"label": "jiji", "name": {"first": "jiji", "last": null}}'
+    assert typedjson.dumps(point, type_=PointJson) == expectation
+    assert typedjson.dumps([point], type_=List[PointJson]) == f"[{expectation}]"
+    assert typedjson.loads(PointJson, expectation) == point
+
+    assert typedjson.dumps(point) == expectation
+    assert typedjson.dumps([point]) == f"[{expectation}]"
+
+    # Named tuples are also decoded from arrays, into which `json` serializes them.
+    assert typedjson.loads(PointJson, '["jiji", {"first": "jiji"}]') == point
+
+
+def test_dumps_union_with_type() -> None:
+    point = PointJson(label="jiji", name=data.name)
+    type_ = List[Union[PointJson, NameJson, int]]
+    expectation = [
+        {"label": "jiji", "name": {"first": "jiji", "last": None}},
+        {"first": "jiji", "last": None},
+        13,
+    ]
+    assert typedjson.compile_encoder(type_)([point, data.name, 13]) == expectation
+    assert typedjson.dumps([point, data.name, 13], type_=type_) == (
+        '[{"label": "jiji", "name": {"first": "jiji", "last": null}}, '
+        '{"first": "jiji", "last": null}, 13]'
+    )
+
+
+def test_dumps_slotted_dataclass() -> None:
+    name = typedjson.slotted(NameJson)(first="jiji", last=None)
+    expectation = '{"first": "jiji", "last": null}'
+    assert typedjson.dumps(name) == expectation
+    assert typedjson.dumps(name, type_=type(name)) == expectation
+
+
+@dataclass(frozen=True)
+class PaymentJson:
+    id: UUID
+    paid_at: datetime
+    due: Optional[date]
+    amount: Decimal
+
+
+def test_dumps_stdlib_types() -> None:
+    payment = PaymentJson(
+        id=UUID("12345678-1234-5678-1234-567812345678"),
+        paid_at=datetime(2020, 1, 2, 3, 4, 5),
+        due=None,
+        amount=Decimal("0.1"),
+    )
+    expectation = (
+        '{"id": "12345678-1234-5678-1234-567812345678",'
+        ' "paid_at": "2020-01-02T03:04:05", "due": null, "amount": "0.1"}'
+    )
+    assert typedjson.dumps(payment) == expectation
+    assert typedjson.dumps(payment, type_=PaymentJson) == expectation
+    assert typedjson.compile_encoder(PaymentJson)(payment)["amount"] == "0.1"
+
+
+def test_dumps_with_registered_encoder() -> None:
+    @dataclass(frozen=True)
+    class CentsJson:
+        value: int
+
+    typedjson.register_encoder(CentsJson, lambda c: f"{c.value}c")
+    assert typedjson.dumps([CentsJson(1)]) == '["1c"]'
+    assert typedjson.dumps([CentsJson(1)], type_=List[CentsJson]) == '["1c"]'
+    assert typedjson.compile_encoder(List[CentsJson])([CentsJson(2)]) == ["2c"]
+
+
+class ColorJson(Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+@dataclass(frozen=True)
+class PaintJson:
+    color: ColorJson
+    colors: List[ColorJson]
+    kind: Literal[ColorJson.GREEN]
+
+
+def test_dumps_enum() -> None:
+    paint = PaintJson(
+        color=ColorJson.RED, colors=[ColorJson.GREEN], kind=ColorJson.GREEN
+    )
+    expectation = '{"color": "red", "colors": ["green"], "kind": "green"}'
+    assert typedjson.dumps(paint) == expectation
+    assert typedjson.dumps(paint, type_=PaintJson) == expectation
+    assert typedjson.compile_encoder(PaintJson)(paint) == {
+        "color": "red",
+        "colors": ["green"],
+        "kind": "green",
+    }
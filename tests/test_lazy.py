@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+from typing import List
+from typing import Optional
+
+import pytest
+
+import typedjson
+from typedjson import DecodingError
+from typedjson import TypeMismatch
+from typedjson import UnsupportedDecoding
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class NameJson:
+    first: str
+    last: str
+
+
+@dataclass(frozen=True)
+class UserJson:
+    id: str
+    age: int
+    name: NameJson
+    friends: List["UserJson"]
+    boss: Optional["UserJson"]
+
+
+json = {
+    "id": "jiji",
+    "age": 13,
+    "name": {"first": "Jiji", "last": "Kiki"},
+    "friends": [
+        {"id": "gin", "age": 3, "name": {"first": "Gin"}, "friends": []},
+    ],
+}
+
+
+def test_can_decode_lazily() -> None:
+    user = typedjson.decode(UserJson, json, lazy=True)
+    assert isinstance(user, UserJson)
+    assert user.id == "jiji"
+    assert user.name == NameJson(first="Jiji", last="Kiki")
+    assert user.friends[0].name.first == "Gin"
+    assert user.boss is None
+
+
+def test_cannot_decode_lazily_field_with_wrong_value() -> None:
+    user = typedjson.decode(UserJson, json, lazy=True)
+    assert isinstance(user, UserJson)
+
+    expectation = DecodingError(TypeMismatch(("friends", "0", "name", "last")))
+    with pytest.raises(DecodingError) as error:
+        user.friends[0].name.last
+    assert error.value == expectation
+
+
+def test_can_force_proxy() -> None:
+    json_ = dict(json, friends=[])
+    user = typedjson.decode(UserJson, json_, lazy=True)
+    forced = typedjson.force(user)
+    assert type(forced) is UserJson
+    assert forced == typedjson.decode(UserJson, json_)
+    assert user == forced
+    assert typedjson.dumps(user) == typedjson.dumps(forced)
+
+
+def test_can_pickle_proxy() -> None:
+    import pickle
+
+    json_ = dict(json, friends=[])
+    user = typedjson.decode(UserJson, json_, lazy=True)
+    loaded = pickle.loads(pickle.dumps(user))
+    assert type(loaded) is UserJson
+    assert loaded == typedjson.decode(UserJson, json_)
+
+
+def test_can_copy_proxy() -> None:
+    import copy
+
+    json_ = dict(json, friends=[])
+    user = typedjson.decode(UserJson, json_, lazy=True)
+    assert type(copy.copy(user)) is UserJson
+    assert copy.deepcopy(user) == typedjson.decode(UserJson, json_)
+
+
+def test_can_replace_fields_of_proxy() -> None:
+    from dataclasses import replace
+
+    json_ = dict(json, friends=[])
+    user = typedjson.decode(UserJson, json_, lazy=True)
+    replaced = replace(user, age=14)
+    assert type(replaced) is UserJson
+    assert replaced == replace(typedjson.decode(UserJson, json_), age=14)
+
+
+def test_cannot_force_proxy_with_wrong_field() -> None:
+    user = typedjson.decode(UserJson, json, lazy=True)
+    with pytest.raises(DecodingError) as error:
+        typedjson.force(user)
+    assert error.value == DecodingError(TypeMismatch(("friends", "0", "name", "last")))
+
+
+def test_cannot_decode_lazily_non_object() -> None:
+    expectation = DecodingError(UnsupportedDecoding(()))
+    assert typedjson.decode(UserJson, [], lazy=True) == expectation
+
+
+def test_can_decode_only_selected_fields() -> None:
+    json_ = dict(json, age="13")
+    user = typedjson.decode(UserJson, json_, only={"name.first", "friends.*.id"})
+    assert isinstance(user, UserJson)
+    assert user.name.first == "Jiji"
+    assert user.friends[0].id == "gin"
+
+    user_boss = typedjson.decode(UserJson, json_, only={("boss", "id")})
+    assert isinstance(user_boss, UserJson)
+    assert user_boss.boss is None
+
+    with pytest.raises(DecodingError) as error:
+        user.age
+    assert error.value == DecodingError(TypeMismatch(("age",)))
+
+
+def test_cannot_decode_selected_field_with_wrong_value() -> None:
+    expectation = DecodingError(TypeMismatch(("friends", "0", "name", "last")))
+    only = {"id", "friends.*.name"}
+    assert typedjson.decode(UserJson, json, only=only) == expectation
+
+
+def test_cannot_decode_selected_field_like_eager_decoding() -> None:
+    for json_, only in [
+        (dict(json, friends=[], boss=5), {"boss.id"}),
+        (dict(json, friends=[1]), {"friends.*.id"}),
+    ]:
+        expectation = typedjson.decode(UserJson, json_)
+        assert isinstance(expectation, DecodingError)
+        assert typedjson.decode(UserJson, json_, only=only) == expectation
+
+
+def test_cannot_access_field_like_forcing_proxy() -> None:
+    for json_, field in [
+        (dict(json, friends=[], boss=5), "boss"),
+        (dict(json, friends=[1]), "friends"),
+    ]:
+        user = typedjson.decode(UserJson, json_, lazy=True)
+        with pytest.raises(DecodingError) as error:
+            typedjson.force(user)
+        with pytest.raises(DecodingError) as error_field:
+            getattr(user, field)
+        assert error_field.value == error.value
+
+
+def test_cannot_select_unknown_field() -> None:
+    with pytest.raises(ValueError):
+        typedjson.decode(UserJson, json, only={"name.middle"})
+
+    with pytest.raises(ValueError):
+        typedjson.decode(UserJson, json, only={"friends.id"})
@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 
+from typing import Any
+from typing import List
 from typing import Optional
+from typing import Union
+
+import pytest
 
 import typedjson
+from typedjson import DecodingError
+from typedjson import TypeMismatch
 from dataclasses import dataclass
 
 
@@ -21,6 +28,11 @@ class CatJson:
 
 expectation = CatJson(id="test-cat", age=13, name=NameJson(first="jiji", last=None))
 
+expectation_seq = [
+    expectation,
+    CatJson(id="test-cat-2", age=2, name=NameJson(first="gin", last="mitsuse")),
+]
+
 
 def test_load() -> None:
     with open("fixtures/cat_jiji.json") as f:
@@ -32,3 +44,123 @@ def test_loads() -> None:
         json = f.read()
 
     assert typedjson.loads(CatJson, json) == expectation
+
+
+def test_loads_with_codegen() -> None:
+    with open("fixtures/cat_jiji.json") as f:
+        json = f.read()
+
+    assert typedjson.loads(CatJson, json, codegen=True) == expectation
+
+
+def test_load_binary() -> None:
+    with open("fixtures/cat_jiji.json", "rb") as f:
+        assert typedjson.load(CatJson, f) == expectation
+
+
+def test_loads_bytes() -> None:
+    with open("fixtures/cat_jiji.json", "rb") as f:
+        json = f.read()
+
+    assert typedjson.loads(CatJson, json) == expectation
+
+
+def test_loads_with_parser() -> None:
+    import pytest
+
+    pytest.importorskip("orjson")
+
+    with open("fixtures/cat_jiji.json", "rb") as f:
+        json = f.read()
+
+    assert typedjson.loads(CatJson, json, parser="orjson") == expectation
+
+
+def test_loads_with_registered_parser() -> None:
+    import json
+
+    class Parser:
+        def loads(self, string: Union[str, bytes]) -> Any:
+            return {**json.loads(string), "age": 14}
+
+    with open("fixtures/cat_jiji.json") as f:
+        text = f.read()
+
+    typedjson.register_parser("test", Parser())
+    try:
+        cat = typedjson.loads(CatJson, text, parser="test")
+    finally:
+        typedjson.unregister_parser("test")
+
+    assert cat == CatJson(id="test-cat", age=14, name=NameJson(first="jiji", last=None))
+    with pytest.raises(ValueError):
+        typedjson.loads(CatJson, text, parser="test")
+
+
+def test_loads_with_workers() -> None:
+    import json
+
+    cats = [{"id": f"cat-{i}", "age": i, "name": {"first": "jiji"}} for i in range(300)]
+    decoded = typedjson.loads(List[CatJson], json.dumps(cats), workers=2)
+    assert decoded == typedjson.loads(List[CatJson], json.dumps(cats))
+
+    cats[200] = {"id": "cat-200", "name": {"first": "jiji"}}
+    try:
+        typedjson.loads(List[CatJson], json.dumps(cats), workers=2)
+        assert False
+    except DecodingError as e:
+        assert e == DecodingError(TypeMismatch(("200", "age")))
+
+
+def test_load_iter() -> None:
+    with open("fixtures/cats.json") as f:
+        assert list(typedjson.load_iter(CatJson, f)) == expectation_seq
+
+
+def test_load_iter_with_small_chunks() -> None:
+    import io
+
+    class Trickle(io.StringIO):
+        def read(self, size: Optional[int] = -1) -> str:
+            return super().read(3)
+
+    with open("fixtures/cats.json") as f:
+        json = Trickle(f.read())
+
+    assert list(typedjson.load_iter(CatJson, json)) == expectation_seq
+
+
+def test_load_iter_empty() -> None:
+    import io
+
+    assert list(typedjson.load_iter(CatJson, io.StringIO(" [ ] "))) == []
+
+
+def test_load_iter_with_incompatible() -> None:
+    import io
+
+    json = io.StringIO('[{"first": "jiji"}, {"last": "mitsuse"}]')
+
+    iterator = typedjson.load_iter(NameJson, json)
+    assert next(iterator) == NameJson(first="jiji", last=None)
+
+    try:
+        next(iterator)
+        assert False
+    except DecodingError as e:
+        assert e == DecodingError(TypeMismatch(("1", "first")))
+
+
+def test_load_iter_binary() -> None:
+    with open("fixtures/cats.json", "rb") as f:
+        assert list(typedjson.load_iter(CatJson, f)) == expectation_seq
+
+
+def test_load_lines() -> None:
+    with open("fixtures/cats.jsonl") as f:
+        assert list(typedjson.load_lines(CatJson, f)) == expectation_seq
+
+
+def test_load_lines_binary() -> None:
+    with open("fixtures/cats.jsonl", "rb") as f:
+        assert list(typedjson.load_lines(CatJson, f)) == expectation_seq
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+from typing import List
+from typing import Optional
+from typing import Union
+
+import typedjson
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CatJson:
+    lives: int
+
+
+@dataclass(frozen=True)
+class DogJson:
+    breed: str
+
+
+@dataclass(frozen=True)
+class PetJson:
+    name: str
+    pet: Union[CatJson, DogJson]
+    age: Optional[int]
+
+
+json = [
+    {"name": "tama", "pet": {"lives": 9}, "age": None},
+    {"name": "pochi", "pet": {"breed": "shiba"}, "age": 3},
+]
+
+
+def test_can_count_calls_of_decoders() -> None:
+    with typedjson.profile() as profile:
+        decoded = typedjson.decode(List[PetJson], json)
+
+    assert decoded == [
+        PetJson(name="tama", pet=CatJson(lives=9), age=None),
+        PetJson(name="pochi", pet=DogJson(breed="shiba"), age=3),
+    ]
+
+    stats = profile.stats
+    assert stats[(List[PetJson], "list")].calls == 1
+    assert stats[(PetJson, "class")].calls == 2
+    assert stats[(PetJson, "class")].produced == 2
+    assert stats[(Union[CatJson, DogJson], "union")].calls == 2
+    assert stats[(Optional[int], "union")].calls == 2
+    assert stats[(List[PetJson], "list")].seconds > 0.0
+
+
+def test_can_count_failed_tries_of_union_members() -> None:
+    @dataclass(frozen=True)
+    class IntJson:
+        value: int
+
+    @dataclass(frozen=True)
+    class StrJson:
+        value: str
+
+    # Both members have the same keys, so `{"value": "a"}` is tried as `IntJson` first.
+    with typedjson.profile() as profile:
+        typedjson.decode(List[Union[IntJson, StrJson]], [{"value": 1}, {"value": "a"}])
+
+    stats = profile.stats
+    assert stats[(IntJson, "class")].calls == 2
+    assert stats[(IntJson, "class")].failures == 1
+    assert stats[(IntJson, "class")].produced == 1
+    assert stats[(StrJson, "class")].calls == 1
+    assert stats[(StrJson, "class")].failures == 0
+
+
+def test_can_count_failed_decoding_once() -> None:
+    failing = [{"name": "tama", "pet": {"lives": "nine"}, "age": None}]
+    with typedjson.profile() as profile:
+        decoded = typedjson.decode(List[PetJson], failing)
+
+    assert isinstance(decoded, typedjson.DecodingError)
+
+    stats = profile.stats
+    assert stats[(List[PetJson], "list")].calls == 1
+    assert stats[(List[PetJson], "list")].failures == 1
+    assert stats[(PetJson, "class")].calls == 1
+    assert stats[(PetJson, "class")].failures == 1
+    assert stats[(Union[CatJson, DogJson], "union")].calls == 1
+    assert stats[(Union[CatJson, DogJson], "union")].failures == 1
+    assert stats[(CatJson, "class")].calls == 1
+    assert stats[(CatJson, "class")].failures == 1
+
+
+def test_can_export_rows() -> None:
+    with typedjson.profile() as profile:
+        typedjson.decode(List[PetJson], json, codegen=True)
+
+    rows = profile.rows()
+    assert {"type": "PetJson", "decoder": "class"} in [
+        {"type": r["type"], "decoder": r["decoder"]} for r in rows
+    ]
+    assert [r["seconds"] for r in rows] == sorted(
+        [r["seconds"] for r in rows], reverse=True
+    )
+
+
+def test_cannot_record_outside_profile() -> None:
+    with typedjson.profile() as profile:
+        pass
+
+    typedjson.decode(List[PetJson], json)
+    typedjson.decode_many(PetJson, json)
+    assert profile.stats == {}
+
+
+def test_can_record_decode_many_and_loads() -> None:
+    with typedjson.profile() as profile:
+        typedjson.decode_many(PetJson, json)
+        typedjson.loads(PetJson, '{"name": "tama", "pet": {"lives": 9}, "age": 1}')
+
+    assert profile.stats[(PetJson, "class")].calls == 3
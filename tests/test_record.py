@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+from typing import Optional
+
+import pytest
+
+import typedjson
+from dataclasses import dataclass
+from dataclasses import FrozenInstanceError
+
+
+@typedjson.slotted
+@dataclass(frozen=True)
+class NameJson:
+    first: str
+    last: Optional[str] = None
+
+
+def test_can_create_slotted_dataclass() -> None:
+    name = NameJson(first="jiji")
+    assert name == NameJson(first="jiji", last=None)
+    assert NameJson.__slots__ == ("first", "last")
+    assert not hasattr(name, "__dict__")
+
+
+def test_cannot_modify_frozen_slotted_dataclass() -> None:
+    with pytest.raises(FrozenInstanceError):
+        NameJson(first="jiji").first = "kiki"  # type: ignore
+
+
+def test_can_pickle_frozen_slotted_dataclass() -> None:
+    import pickle
+
+    name = NameJson(first="jiji", last="kiki")
+    assert pickle.loads(pickle.dumps(name)) == name
+
+
+def test_cannot_create_slotted_non_dataclass() -> None:
+    class Name:
+        pass
+
+    with pytest.raises(TypeError):
+        typedjson.slotted(Name)
+
+
+@typedjson.slotted
+@dataclass(frozen=True)
+class PetJson:
+    name: str
+
+    def describe(self) -> str:
+        return self.name
+
+
+@typedjson.slotted
+@dataclass(frozen=True)
+class CatJson(PetJson):
+    age: int
+
+    def describe(self) -> str:
+        return f"{super().describe()} ({self.age})"
+
+    @property
+    def title(self) -> str:
+        return super().describe().upper()
+
+
+def test_can_call_super_in_slotted_dataclass() -> None:
+    cat = CatJson(name="jiji", age=13)
+    assert cat.describe() == "jiji (13)"
+    assert cat.title == "JIJI"
+    assert CatJson.__slots__ == ("age",)
+    assert not hasattr(cat, "__dict__")
+
+
+def test_cannot_create_slotted_dataclass_of_non_slotted_base() -> None:
+    @dataclass(frozen=True)
+    class Pet:
+        name: str
+
+    @dataclass(frozen=True)
+    class Cat(Pet):
+        age: int
+
+    with pytest.raises(TypeError):
+        typedjson.slotted(Cat)
@@ -1,21 +1,87 @@
 #!/usr/bin/env python3
 
+from importlib import import_module
+from typing import Any
+from typing import TYPE_CHECKING
+
+from typedjson.decoding import Array
+from typedjson.decoding import clear_caches
+from typedjson.decoding import compile_decoder
 from typedjson.decoding import decode
+from typedjson.decoding import decode_many
 from typedjson.decoding import DecodingError
+from typedjson.decoding import Discriminator
+from typedjson.decoding import force
+from typedjson.decoding import NumpyArray
+from typedjson.decoding import register_decoder
 from typedjson.decoding import TypeMismatch
 from typedjson.decoding import UnsupportedDecoding
+from typedjson.dumping import compile_encoder
 from typedjson.dumping import dump
 from typedjson.dumping import dumps
+from typedjson.dumping import dumps_iter
+from typedjson.dumping import register_encoder
 from typedjson.loading import load
+from typedjson.loading import load_iter
+from typedjson.loading import load_lines
 from typedjson.loading import loads
+from typedjson.loading import Parser
+from typedjson.loading import register_parser
+from typedjson.loading import unregister_parser
+
+if TYPE_CHECKING:
+    from typedjson.profiling import DecoderStats
+    from typedjson.profiling import profile
+    from typedjson.profiling import Profile
+    from typedjson.record import slotted
+
+# Names of the API in modules which are imported on the first access to the names
+# to keep importing typedjson cheap.
+_lazy_names = {
+    "DecoderStats": "typedjson.profiling",
+    "profile": "typedjson.profiling",
+    "Profile": "typedjson.profiling",
+    "slotted": "typedjson.record",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _lazy_names.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
+    "Array",
+    "clear_caches",
+    "compile_decoder",
     "decode",
+    "decode_many",
     "DecodingError",
+    "Discriminator",
+    "NumpyArray",
+    "register_decoder",
     "TypeMismatch",
     "UnsupportedDecoding",
+    "compile_encoder",
     "dump",
     "dumps",
+    "dumps_iter",
+    "register_encoder",
+    "force",
     "load",
+    "load_iter",
+    "load_lines",
     "loads",
+    "Parser",
+    "register_parser",
+    "unregister_parser",
+    "DecoderStats",
+    "profile",
+    "Profile",
+    "slotted",
 ]
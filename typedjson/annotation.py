@@ -1,9 +1,29 @@
 #!/usr/bin/env python3
 
+from enum import Enum
+from functools import lru_cache
+from typing import Any
 from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Type
 from typing import Tuple
+from typing import Union
+
+import collections.abc
+import typing
+import typing_extensions
+from typing_extensions import get_type_hints
+
+# `typing_extensions` may define `Literal` on its own in old versions of Python.
+_literals = tuple(
+    t
+    for t in (typing_extensions.Literal, getattr(typing, "Literal", None))
+    if t is not None
+)
+
+# The origins of `Dict[K, V]`, `Mapping[K, V]` and `MutableMapping[K, V]`.
+_mappings = (dict, collections.abc.Mapping, collections.abc.MutableMapping)
 
 
 def args_of(type_: Type) -> Tuple[Type, ...]:
@@ -12,22 +32,51 @@ def args_of(type_: Type) -> Tuple[Type, ...]:
 
 
 def hints_of(type_: Type) -> Optional[Dict[str, Type]]:
-    from typing import get_type_hints
-    from copy import copy
+    # The resolved hints are cached and shared between callers, so do not modify them.
+    return _hints_of(type_, key_of(type_))
+
+
+def key_of(type_: Type) -> Any:
+    # `Union` types equal regardless of the order of their members, which matters to
+    # decoding. Caches of types use this key to distinguish them by the order.
+    args = getattr(type_, "__args__", None)
+    if args is None or len(args) == 0:
+        return type_
+    else:
+        return (type_, tuple(map(key_of, args)))
 
+
+def clear_hints() -> None:
+    # Resolved hints refer to the classes at the time of resolution.
+    # Clear them when classes are redefined, e.g. by reloading modules.
+    _hints_of.cache_clear()
+    _annotations_of.cache_clear()
+
+
+@lru_cache(maxsize=1024)
+def _hints_of(type_: Type, key: Any) -> Optional[Dict[str, Type]]:
     origin = origin_of(type_)
+    if (
+        origin is Union
+        or origin in _mappings
+        or literals_of(type_) is not None
+        or len(metadata_of(type_)) > 0
+    ):
+        return None
+
     args = args_of(type_)
     type__ = type_ if origin is None else origin
     mapping = dict(zip(parameters_of(type_), args))
 
     # if hasattr(type__, '__annotations__'):
     if hasattr(type__, "__init__"):
-        annotations = get_type_hints(type__.__init__)
+        annotations = _annotations_of(type__)
+        if is_namedtuple(type__) and len(annotations) < len(type__._fields):
+            return None
+
         if len(mapping) > 0:
             annotations_: Dict[str, Type] = {}
             for n, t in annotations.items():
-                if n == "return":
-                    continue
                 t_ = mapping.get(t)
                 if t_ is None:
                     return None
@@ -35,17 +84,37 @@ def hints_of(type_: Type) -> Optional[Dict[str, Type]]:
                     annotations_[n] = t_
             return annotations_
         else:
-            annotations_ = copy(annotations)
-            annotations_.pop("return", None)
-            return annotations_
+            return annotations
     else:
         return None
 
 
-def origin_of(type_: Type) -> Optional[Type]:
-    from typing import List
-    from typing import Tuple
+@lru_cache(maxsize=1024)
+def _annotations_of(type_: Type) -> Dict[str, Type]:
+    # Fields of named tuples are annotated on the class instead of `__init__`.
+    if is_namedtuple(type_):
+        hints = get_type_hints(type_, include_extras=True)
+        return {k: hints[k] for k in type_._fields if k in hints}
+
+    annotations = dict(get_type_hints(type_.__init__, include_extras=True))
+    annotations.pop("return", None)
+    return annotations
+
+
+def is_namedtuple(type_: Type) -> bool:
+    # Classes created by `NamedTuple` or `collections.namedtuple`.
+    return (
+        isinstance(type_, type)
+        and issubclass(type_, tuple)
+        and hasattr(type_, "_fields")
+    )
+
+
+def is_enum(type_: Type) -> bool:
+    return isinstance(type_, type) and issubclass(type_, Enum)
+
 
+def origin_of(type_: Type) -> Optional[Type]:
     origin = getattr(type_, "__origin__", None)
 
     # In Python 3.6, the origin of Tuple type is `List` but in Python 3.7 it is `list`.
@@ -69,3 +138,18 @@ def parameters_of(type_: Type) -> Tuple[Type, ...]:
     else:
         parameters = getattr(origin, "__parameters__", None)
         return tuple() if parameters is None else parameters  # type: ignore
+
+
+def literals_of(type_: Type) -> Optional[Tuple[Any, ...]]:
+    # The values of `Literal[...]`, or `None` for the other types.
+    return args_of(type_) if origin_of(type_) in _literals else None
+
+
+def metadata_of(type_: Type) -> Tuple[Any, ...]:
+    # The metadata of `Annotated[T, ...]`, which is empty for the other types.
+    return getattr(type_, "__metadata__", ())  # type: ignore
+
+
+def unannotated_of(type_: Type) -> Type:
+    # `T` of `Annotated[T, ...]`, or the type itself for the other types.
+    return type_.__origin__ if len(metadata_of(type_)) > 0 else type_  # type: ignore
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Type
+from typing import TypeVar
+from typing import Union
+
+from typedjson.annotation import args_of
+from typedjson.annotation import hints_of
+from typedjson.annotation import key_of
+from typedjson.annotation import origin_of
+from typedjson.decoding import _decoder_of
+from typedjson.decoding import _entry_of
+from typedjson.decoding import _exact_of
+from typedjson.decoding import _failure
+from typedjson.decoding import _is_class
+from typedjson.decoding import _objects_of
+from typedjson.decoding import Decoder
+from typedjson.decoding import DecodingError
+from typedjson.decoding import Path
+
+Decoded = TypeVar("Decoded")
+
+# Types checked inline by generated code before falling back to compiled decoders.
+_primitives = (str, int, bool, float)
+
+
+def generate_decoder(
+    type_: Type[Decoded], reuse_input: bool = False
+) -> Callable[[Any, Path], Union[Decoded, DecodingError]]:
+    # Generate straight-line Python code for the classes reachable from the type.
+    # The code does not track paths, so failures are decoded again by the compiled
+    # decoder to report identical errors.
+    return _entry_of(type_, True, reuse_input)
+
+
+def _generated_of(type_: Any, reuse_input: bool) -> Decoder:
+    return _cached_generated_of(type_, reuse_input, key_of(type_))
+
+
+@lru_cache(maxsize=256)
+def _cached_generated_of(type_: Any, reuse_input: bool, key: Any) -> Decoder:
+    decoder = _decoder_of(type_, reuse_input)
+    if not (_is_class(type_) or _is_list(type_)):
+        return decoder
+
+    generator = _Generator(reuse_input)
+    generator.function_of(type_)
+    generated = generator.build()[generator.name_of(type_)]
+
+    def _decode(json: Any, path: Optional[Path]) -> Any:
+        if path is None:
+            return generated(json)
+        else:
+            return decoder(json, path)
+
+    return _decode
+
+
+def _is_list(type_: Type) -> bool:
+    return origin_of(type_) is list
+
+
+def _optional_of(type_: Type) -> Optional[Type]:
+    if origin_of(type_) is not Union:
+        return None
+
+    args = args_of(type_)
+    if len(args) == 2 and args[1] is type(None):
+        return args[0]
+    else:
+        return None
+
+
+class _Generator:
+    # Generated functions take JSON only and return `_failure` on failure.
+    # Compiled decoders are called with `None` as path to behave the same way.
+
+    def __init__(self, reuse_input: bool) -> None:
+        self.__reuse_input = reuse_input
+        self.__calls: Dict[Any, str] = {}
+        self.__names: Dict[Any, str] = {}
+        self.__sources: List[str] = []
+        self.__namespace: Dict[str, Any] = {
+            "DecodingError": DecodingError,
+            "Iterable": Iterable,
+            "_failure": _failure,
+        }
+
+    def build(self) -> Dict[str, Any]:
+        exec("\n".join(self.__sources), self.__namespace)
+        return self.__namespace
+
+    def name_of(self, type_: Type) -> str:
+        return self.__names[key_of(type_)]
+
+    def function_of(self, type_: Type) -> str:
+        key = key_of(type_)
+        call = self.__calls.get(key)
+        if call is not None:
+            return call
+
+        if _is_class(type_) or _is_list(type_):
+            name = self.__names[key] = f"_decode_{len(self.__names)}"
+            call = self.__calls[key] = f"{name}({{}})"
+            if _is_class(type_):
+                self.__sources.append(self.__generate_class(name, type_))
+            else:
+                self.__sources.append(self.__generate_list(name, type_))
+        else:
+            call = self.__calls[key] = f"{self.__decoder(type_)}({{}}, None)"
+
+        return call
+
+    def __bind(self, value: Any) -> str:
+        name = f"_value_{len(self.__namespace)}"
+        self.__namespace[name] = value
+        return name
+
+    def __decoder(self, type_: Type) -> str:
+        return self.__bind(_decoder_of(type_, self.__reuse_input))
+
+    def __generate_class(self, name: str, type_: Type) -> str:
+        annotations = hints_of(type_)
+        assert annotations is not None
+
+        # Named tuples decoded from arrays fail over to the compiled decoder.
+        named = list in _objects_of(type_)
+        failure = f"{self.__decoder(type_)}(json, None)" if named else "_failure"
+        lines = [
+            f"def {name}(json):",
+            "    if not isinstance(json, dict):",
+            f"        return {failure}",
+            "    get = json.get",
+        ]
+
+        parameters: List[str] = []
+        for index, (key, t) in enumerate(annotations.items()):
+            value = f"v{index}"
+            lines.append(f"    {value} = get({key!r})")
+            lines.extend(self.__convert(t, value, "    "))
+            parameters.append(value)
+
+        constructor = self.__bind(type_)
+        lines.append(f"    return {constructor}({', '.join(parameters)})")
+        return "\n".join(lines) + "\n"
+
+    def __generate_list(self, name: str, type_: Type) -> str:
+        # Decoding as list may fail over to the other decoders for the type.
+        fallback = self.__decoder(type_)
+        lines = [
+            f"def {name}(json):",
+            "    if not isinstance(json, Iterable):",
+            f"        return {fallback}(json, None)",
+        ]
+
+        # Lists are copied at once when their elements need no conversion.
+        exact = _exact_of(args_of(type_)[0])
+        if len(exact) > 0:
+            kinds = self.__bind(exact)
+            copy = "json" if self.__reuse_input else "json[:]"
+            lines.extend(
+                [
+                    f"    if json.__class__ is list and set(map(type, json)) <= {kinds}:",
+                    f"        return {copy}",
+                ]
+            )
+
+        lines.extend(
+            [
+                "    list_decoded = []",
+                "    append = list_decoded.append",
+                "    for value in json:",
+                *self.__convert(
+                    args_of(type_)[0], "value", "        ", f"{fallback}(json, None)"
+                ),
+                "        append(value)",
+                "    return list_decoded",
+            ]
+        )
+        return "\n".join(lines) + "\n"
+
+    def __convert(
+        self, type_: Type, value: str, indent: str, failure: Optional[str] = None
+    ) -> List[str]:
+        def _call(call: str, indent: str) -> List[str]:
+            return [
+                f"{indent}{value} = {call.format(value)}",
+                f"{indent}if isinstance({value}, DecodingError):",
+                f"{indent}    return {value if failure is None else failure}",
+            ]
+
+        optional = _optional_of(type_)
+        if type_ in _primitives:
+            decoder = self.__decoder(type_)
+            return [
+                f"{indent}if {value}.__class__ is not {type_.__name__}:",
+                *_call(f"{decoder}({{}}, None)", indent + "    "),
+            ]
+        elif type_ is type(None):
+            decoder = self.__decoder(type_)
+            return [
+                f"{indent}if {value} is not None:",
+                *_call(f"{decoder}({{}}, None)", indent + "    "),
+            ]
+        elif optional in _primitives:
+            decoder = self.__decoder(type_)
+            return [
+                f"{indent}if {value} is not None"
+                f" and {value}.__class__ is not {optional.__name__}:",
+                *_call(f"{decoder}({{}}, None)", indent + "    "),
+            ]
+        elif optional is not None and (_is_class(optional) or _is_list(optional)):
+            call = self.function_of(optional)
+            decoder = self.__decoder(type_)
+            return [
+                f"{indent}if {value} is not None:",
+                f"{indent}    decoded = {call.format(value)}",
+                f"{indent}    if isinstance(decoded, DecodingError):",
+                *_call(f"{decoder}({{}}, None)", indent + "        "),
+                f"{indent}    else:",
+                f"{indent}        {value} = decoded",
+            ]
+        else:
+            return _call(self.function_of(type_), indent)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+from typing import Any
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from typedjson.annotation import _mappings
+from typedjson.annotation import args_of
+from typedjson.annotation import hints_of
+from typedjson.annotation import literals_of
+from typedjson.annotation import metadata_of
+from typedjson.annotation import origin_of
+from typedjson.annotation import unannotated_of
+from typedjson.decoding import _decoder_of
+from typedjson.decoding import _is_class
+from typedjson.decoding import Array
+from typedjson.decoding import DecodingError
+from typedjson.decoding import Discriminator
+from typedjson.decoding import FailureReason
+from typedjson.decoding import NumpyArray
+from typedjson.decoding import Path
+
+
+def collect_errors(
+    type_: Type, json: Any, path: Path, max_errors: int
+) -> List[FailureReason]:
+    # Collect up to `max_errors` reasons of failures in the order of paths.
+    # Unlike decoding, which stops at the first failure, nested values which fail
+    # to decode are searched for failures in them with their own paths.
+    reasons: List[FailureReason] = []
+    _collect(type_, json, path, reasons, max_errors)
+    return reasons
+
+
+def _collect(
+    type_: Type, json: Any, path: Path, reasons: List[FailureReason], max_errors: int
+) -> None:
+    # Values are decoded without paths first to skip those which decode successfully.
+    decoder = _decoder_of(type_, False)
+    if not isinstance(decoder(json, None), DecodingError):
+        return
+
+    count = len(reasons)
+    for t, value, key in _children_of(type_, json):
+        _collect(t, value, path if key is None else path + (key,), reasons, max_errors)
+        if len(reasons) >= max_errors:
+            return
+
+    # The value fails by itself, e.g. by its class or the length of a tuple.
+    if len(reasons) == count:
+        reasons.append(decoder(json, path).reason)
+
+
+def _children_of(type_: Type, json: Any) -> Iterator[Tuple[Type, Any, Any]]:
+    # Return nested values with their types and keys, which are `None` for the values
+    # decoded in place of the value itself, e.g. the value of `Optional[T]`.
+    # Types of which decoders do not simply decode nested values have no children.
+    origin = origin_of(type_)
+    args = args_of(type_)
+
+    if len(metadata_of(type_)) > 0:
+        markers = (Array, Discriminator, NumpyArray)
+        if not any(isinstance(m, markers) for m in metadata_of(type_)):
+            yield unannotated_of(type_), json, None
+    elif literals_of(type_) is not None:
+        return
+    elif origin is Union:
+        if len(args) == 2 and args[1] is type(None) and json is not None:
+            yield args[0], json, None
+    elif origin is tuple:
+        if json.__class__ not in (list, tuple):
+            return
+        elif len(args) == 2 and args[1] is ...:
+            yield from ((args[0], v, str(i)) for i, v in enumerate(json))
+        elif len(json) >= len(args):
+            yield from ((t, v, str(i)) for i, (t, v) in enumerate(zip(args, json)))
+    elif origin is list:
+        if json.__class__ is list and len(args) == 1:
+            yield from ((args[0], v, str(i)) for i, v in enumerate(json))
+    elif origin in _mappings:
+        if json.__class__ is dict and len(args) == 2:
+            yield from ((args[1], v, k) for k, v in json.items())
+    elif json.__class__ is dict and _is_class(type_):
+        annotations = hints_of(type_)
+        if annotations is not None:
+            yield from ((t, json.get(k), k) for k, t in annotations.items())
@@ -1,15 +1,43 @@
 #!/usr/bin/env python3
 
+import threading
+from array import array
+from enum import Enum
+from functools import lru_cache
+from itertools import chain
+from itertools import repeat
+from time import perf_counter
 from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
 from typing import Iterable
-from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Set
 from typing import Tuple
+from typing import TYPE_CHECKING
 from typing import Type
 from typing import TypeVar
 from typing import Union
 
+from typedjson.annotation import _mappings
+from typedjson.annotation import args_of
+from typedjson.annotation import clear_hints
+from typedjson.annotation import hints_of
+from typedjson.annotation import is_enum
+from typedjson.annotation import is_namedtuple
+from typedjson.annotation import key_of
+from typedjson.annotation import literals_of
+from typedjson.annotation import metadata_of
+from typedjson.annotation import origin_of
+from typedjson.annotation import supertype_of
+from typedjson.annotation import unannotated_of
+
+if TYPE_CHECKING:
+    from typedjson.profiling import Profile
+
 Decoded = TypeVar("Decoded")
 Value = TypeVar("Value")
 
@@ -56,183 +84,1106 @@ FailureReason = Union[TypeMismatch, UnsupportedDecoding]
 
 
 class DecodingError(Exception):
-    def __init__(self, reason: FailureReason) -> None:
+    def __init__(
+        self, reason: FailureReason, reasons: Sequence[FailureReason] = ()
+    ) -> None:
         self.__reason = reason
+        self.__reasons = (reason,) if len(reasons) == 0 else tuple(reasons)
 
     def __eq__(self, x: Any) -> bool:
         if isinstance(x, DecodingError):
-            return self.reason == x.reason
+            return self.reason == x.reason and self.reasons == x.reasons
         else:
             return False
 
     def __str__(self) -> str:
-        return f"<DecodingError reason={self.reason}>"
+        if len(self.reasons) == 1:
+            return f"<DecodingError reason={self.reason}>"
+        else:
+            return f"<DecodingError reasons=[{', '.join(map(str, self.reasons))}]>"
 
     @property
     def reason(self) -> FailureReason:
         return self.__reason
 
+    @property
+    def reasons(self) -> Tuple[FailureReason, ...]:
+        # All the reasons collected with `max_errors`, which are the failures of the
+        # nested values themselves. Without them, it consists of `reason`.
+        return self.__reasons
+
+
+class Discriminator:
+    # Mark the field to select a member of a union by, e.g.
+    # `Annotated[Union[CatJson, DogJson], Discriminator("kind")]`.
+    # The field of each member should be typed with `Literal`.
+    def __init__(self, field: str) -> None:
+        self.__field = field
+
+    def __eq__(self, x: Any) -> bool:
+        if isinstance(x, Discriminator):
+            return self.field == x.field
+        else:
+            return False
+
+    def __hash__(self) -> int:
+        return hash(self.field)
+
+    def __repr__(self) -> str:
+        return f"Discriminator({self.field!r})"
+
+    @property
+    def field(self) -> str:
+        return self.__field
+
+
+class Array:
+    # Mark `List[float]` or `List[int]` to decode into `array.array` of the type code,
+    # e.g. `Annotated[List[float], Array("f")]`. The default is "d" or "q".
+    def __init__(self, typecode: Optional[str] = None) -> None:
+        self.__typecode = typecode
+
+    def __eq__(self, x: Any) -> bool:
+        if isinstance(x, Array):
+            return self.typecode == x.typecode
+        else:
+            return False
+
+    def __hash__(self) -> int:
+        return hash(self.typecode)
+
+    def __repr__(self) -> str:
+        return f"Array({self.typecode!r})"
+
+    @property
+    def typecode(self) -> Optional[str]:
+        return self.__typecode
+
+
+class NumpyArray:
+    # Mark `List[float]` or `List[int]` to decode into `numpy.ndarray` of the dtype,
+    # e.g. `Annotated[List[float], NumpyArray("float32")]`. NumPy should be installed.
+    # The default is `float64` or `int64`.
+    def __init__(self, dtype: Any = None) -> None:
+        self.__dtype = dtype
+
+    def __eq__(self, x: Any) -> bool:
+        if isinstance(x, NumpyArray):
+            return bool(self.dtype == x.dtype)
+        else:
+            return False
+
+    def __hash__(self) -> int:
+        return hash(self.dtype)
+
+    def __repr__(self) -> str:
+        return f"NumpyArray({self.dtype!r})"
+
+    @property
+    def dtype(self) -> Any:
+        return self.__dtype
+
 
 def decode(
-    type_: Type[Decoded], json: Any, path: Path = ()
+    type_: Type[Decoded],
+    json: Any,
+    path: Path = (),
+    codegen: bool = False,
+    reuse_input: bool = False,
+    lazy: bool = False,
+    only: Optional[Iterable[Union[str, Path]]] = None,
+    max_errors: int = 1,
 ) -> Union[Decoded, DecodingError]:
-    decoders = (
-        decode_as_union,
-        decode_as_tuple,
-        decode_as_list,
-        decode_as_primitive,
-        decode_as_class,
-    )
+    # With `reuse_input`, lists, tuples and objects of JSON which need no conversion
+    # are returned as they are instead of being copied.
+    # With `lazy`, dataclasses are returned as proxies which decode fields on access.
+    # With `only`, the fields at the paths are decoded first and the others lazily.
+    # With `max_errors` more than 1, errors have up to the number of reasons.
+    if only is not None:
+        from typedjson.lazy import decode_partially
+
+        return decode_partially(type_, json, path, frozenset(only))  # type: ignore
+
+    if lazy:
+        from typedjson.lazy import decode_lazily
+
+        return decode_lazily(type_, json, path)  # type: ignore
+
+    entry = _entry_of(type_, codegen, reuse_input, max_errors)
+    return entry(json, path)  # type: ignore
+
+
+def decode_many(
+    type_: Type[Decoded],
+    jsons: Iterable[Any],
+    codegen: bool = False,
+    workers: Optional[int] = None,
+    reuse_input: bool = False,
+    max_errors: int = 1,
+) -> List[Union[Decoded, DecodingError]]:
+    # Decode each JSON independently. Failures do not stop decoding the rest and
+    # the index of the failed JSON is prepended to the path.
+    # With more than one worker, chunks of JSON are decoded in worker processes.
+    if workers is not None and workers > 1:
+        from typedjson.parallel import decode_in_parallel
+
+        return decode_in_parallel(
+            type_, list(jsons), codegen, workers, reuse_input, max_errors
+        )
+
+    profiled = _profiling.profile is not None
+    decoder = _decoder_for(type_, codegen, reuse_input, max_errors, profiled)
+    return _decode_each(decoder, jsons, 0)
+
+
+def _decode_each(decoder: "Decoder", jsons: Iterable[Any], start: int) -> List[Any]:
+    results: List[Any] = []
+    for index, json in enumerate(jsons, start):
+        decoded = decoder(json, None)
+        if isinstance(decoded, DecodingError):
+            decoded = decoder(json, (str(index),))
+
+        results.append(decoded)
+
+    return results
+
+
+class _Proxy:
+    # The base of proxies, which are subclasses of dataclasses created per type by
+    # `typedjson.lazy`. Their fields are decoded from the JSON object on the first
+    # access and cached.
+    __slots__ = ()
+
+    _typedjson_type: Type
+
+
+def force(value: Value) -> Value:
+    # Decode a proxy with all its fields and return an instance of the dataclass.
+    # Errors of the fields which are not accessed yet are raised here.
+    # The other values are returned as they are.
+    if not isinstance(value, _Proxy):
+        return value
+
+    decoder = _entry_of(value._typedjson_type, False, False)
+    decoded = decoder(value._typedjson_json, value._typedjson_path)  # type: ignore
+    if isinstance(decoded, DecodingError):
+        raise decoded
+
+    return decoded  # type: ignore
+
+
+# Decoders called with `None` as path do not track paths for the sake of speed.
+# Their failures are all `_failure` and are decoded again with a path to locate them.
+Decoder = Callable[[Any, Optional[Path]], Any]
+
+# Compilers return decoders of types or `None` for the types they do not decode.
+Compiler = Callable[[Type], Optional[Decoder]]
+
+_failure = DecodingError(UnsupportedDecoding(()))
+
+
+def clear_caches() -> None:
+    from typedjson.codegen import _cached_generated_of
+    from typedjson.dumping import _encoder_of
+    from typedjson.dumping import _shallow_of
+    from typedjson.dumping import _slots_of
+    from typedjson.dumping import _streamer_of
+    from typedjson.lazy import _lazy_of
+    from typedjson.lazy import _projection_of
+
+    clear_hints()
+    _cached_decoder_of.cache_clear()
+    _cached_entry_of.cache_clear()
+    _cached_generated_of.cache_clear()
+    _encoder_of.cache_clear()
+    _lazy_of.cache_clear()
+    _projection_of.cache_clear()
+    _shallow_of.cache_clear()
+    _slots_of.cache_clear()
+    _streamer_of.cache_clear()
+
+
+def register_decoder(type_: Type[Decoded], decoder: Callable[[Any], Decoded]) -> None:
+    # Decode values of the type by the function, which raises `ValueError` or
+    # `TypeError` for the JSON values it rejects. Types of JSON values are built in.
+    if type_ in (str, int, float, bool, type(None)):
+        raise ValueError(f"Decoding {type_} cannot be replaced")
+
+    _decoders[type_] = decoder
+    clear_caches()
+
+
+def _decode_decimal_of(class_: Type) -> Callable[[Any], Any]:
+    from decimal import InvalidOperation
+
+    def _decode(json: Any) -> Any:
+        # Floats are converted via their shortest representations, e.g. 0.1 into "0.1".
+        if json.__class__ not in (str, int, float):
+            raise TypeError(f"Cannot decode {json.__class__.__name__} as Decimal")
+
+        try:
+            return class_(repr(json) if json.__class__ is float else json)
+        except InvalidOperation as e:
+            raise ValueError(f"Cannot decode {json!r} as Decimal") from e
+
+    return _decode
+
+
+def _decode_isoformat_of(class_: Type) -> Callable[[Any], Any]:
+    fromisoformat = class_.fromisoformat
+
+    def _decode(json: Any) -> Any:
+        return fromisoformat(_utc_of(json))
+
+    return _decode
+
+
+def _utc_of(json: Any) -> Any:
+    # `fromisoformat` accepts "Z" for UTC only since Python 3.11.
+    if json.__class__ is str and json.endswith("Z"):
+        return json[:-1] + "+00:00"
+    else:
+        return json
+
+
+def _decode_uuid_of(class_: Type) -> Callable[[Any], Any]:
+    def _decode(json: Any) -> Any:
+        if json.__class__ is not str:
+            raise TypeError(f"Cannot decode {json.__class__.__name__} as UUID")
+
+        return class_(json)
+
+    return _decode
+
+
+# Decoders registered for types, which take precedence over the kinds of the types.
+_decoders: Dict[Any, Callable[[Any], Any]] = {}
+
+# Decoders of standard types keyed by the qualified names of the types, which are
+# registered when the types are looked up first. Their modules are not imported
+# until then, since the types exist only once they are.
+_standard_decoders: Dict[str, Callable[[Type], Callable[[Any], Any]]] = {
+    "datetime.datetime": _decode_isoformat_of,
+    "datetime.date": _decode_isoformat_of,
+    "datetime.time": _decode_isoformat_of,
+    "decimal.Decimal": _decode_decimal_of,
+    "uuid.UUID": _decode_uuid_of,
+}
+
+
+def _registered_of(type_: Any) -> Optional[Callable[[Any], Any]]:
+    decoder = _decoders.get(type_)
+    if decoder is None and isinstance(type_, type):
+        standard = _standard_decoders.get(f"{type_.__module__}.{type_.__qualname__}")
+        if standard is not None:
+            decoder = _decoders[type_] = standard(type_)
 
-    result_final: Union[Decoded, DecodingError] = DecodingError(
-        UnsupportedDecoding(path)
+    return decoder
+
+
+def compile_decoder(
+    type_: Type[Decoded], reuse_input: bool = False, max_errors: int = 1
+) -> Callable[[Any, Path], Union[Decoded, DecodingError]]:
+    # Analyze the type once and return a decoder specialized for it.
+    # The decoder works like `decode` without re-inspecting the type per value.
+    return _entry_of(type_, False, reuse_input, max_errors)
+
+
+def _decoder_for(
+    type_: Type,
+    codegen: bool,
+    reuse_input: bool,
+    max_errors: int = 1,
+    profiled: bool = False,
+) -> Decoder:
+    # Generated code is not instrumented, so profiled decoders are compiled ones.
+    decoder: Decoder
+    if codegen and not profiled:
+        from typedjson.codegen import _generated_of
+
+        decoder = _generated_of(type_, reuse_input)
+    else:
+        decoder = _decoder_of(type_, reuse_input, profiled)
+
+    return decoder if max_errors <= 1 else _collecting(type_, decoder, max_errors)
+
+
+def _collecting(type_: Type, decoder: Decoder, max_errors: int) -> Decoder:
+    # Failures decoded with paths are searched for the other failures.
+    from typedjson.collecting import collect_errors
+
+    def _decode(json: Any, path: Optional[Path]) -> Any:
+        decoded = decoder(json, path)
+        if path is None or not isinstance(decoded, DecodingError):
+            return decoded
+
+        reasons = collect_errors(type_, json, path, max_errors)
+        return decoded if len(reasons) == 0 else DecodingError(decoded.reason, reasons)
+
+    return _decode
+
+
+def _entry_of(
+    type_: Any, codegen: bool, reuse_input: bool, max_errors: int = 1
+) -> Callable[[Any, Path], Any]:
+    profiled = _profiling.profile is not None
+    return _cached_entry_of(
+        type_, codegen, reuse_input, max_errors, profiled, key_of(type_)
     )
-    for d in decoders:
-        result = d(type_, json, path)
-        if isinstance(result, DecodingError):
-            if isinstance(result.reason, TypeMismatch):
-                result_final = result
+
+
+@lru_cache(maxsize=1024)
+def _cached_entry_of(
+    type_: Any,
+    codegen: bool,
+    reuse_input: bool,
+    max_errors: int,
+    profiled: bool,
+    key: Any,
+) -> Callable[[Any, Path], Any]:
+    decoder = _decoder_for(type_, codegen, reuse_input, max_errors, profiled)
+
+    def _decode(json: Any, path: Path) -> Any:
+        decoded = decoder(json, None)
+        if isinstance(decoded, DecodingError):
+            return decoder(json, path)
         else:
-            result_final = result
-            break
+            return decoded
 
-    return result_final
+    return _decode
 
 
-def decode_as_primitive(
-    type_: Type[Decoded], json: Any, path: Path
-) -> Union[Decoded, DecodingError]:
-    from typedjson.annotation import supertype_of
+def _decoder_of(type_: Any, reuse_input: bool, profiled: bool = False) -> Decoder:
+    return _cached_decoder_of(type_, reuse_input, profiled, key_of(type_))
 
-    supertype = supertype_of(type_)
-    if type_ == float:
-        return (
-            float(json)  # type: ignore
-            if type(json) in (float, int)
-            else DecodingError(TypeMismatch(path))
-        )
-    if type_ in (str, int, bool, type(None)):
-        return json if isinstance(json, type_) else DecodingError(TypeMismatch(path))
-    elif supertype is not None:
-        return (
-            type_(json)  # type: ignore
-            if isinstance(json, supertype)
-            else DecodingError(TypeMismatch(path))
-        )
+
+@lru_cache(maxsize=1024)
+def _cached_decoder_of(
+    type_: Any, reuse_input: bool, profiled: bool, key: Any
+) -> Decoder:
+    reuse_input_outer = _compiling.reuse_input
+    profiled_outer = _compiling.profiled
+    _compiling.reuse_input = reuse_input
+    _compiling.profiled = profiled
+    _compiling.types.add(type_)
+    try:
+        return _compile(type_)
+    finally:
+        _compiling.types.discard(type_)
+        _compiling.reuse_input = reuse_input_outer
+        _compiling.profiled = profiled_outer
+
+
+class _Compiling(threading.local):
+    # The types being compiled and the options to compile them with, which are
+    # shared with the types they refer to.
+    def __init__(self) -> None:
+        self.types: Set[Type] = set()
+        self.reuse_input = False
+        self.profiled = False
+
+
+_compiling = _Compiling()
+
+
+class _Profiling(threading.local):
+    # The profile which decoders called in the thread record to.
+    def __init__(self) -> None:
+        self.profile: Optional["Profile"] = None
+
+
+_profiling = _Profiling()
+
+
+def _resolve(type_: Type) -> Decoder:
+    # Types being compiled refer to themselves (e.g. trees) via a deferred lookup.
+    reuse_input = _compiling.reuse_input
+    profiled = _compiling.profiled
+    if type_ in _compiling.types:
+
+        def _deferred(json: Any, path: Optional[Path]) -> Any:
+            return _decoder_of(type_, reuse_input, profiled)(json, path)
+
+        return _deferred
     else:
-        return DecodingError(UnsupportedDecoding(path))
+        return _decoder_of(type_, reuse_input, profiled)
 
 
-def decode_as_class(
-    type_: Type[Decoded], json: Any, path: Path
-) -> Union[Decoded, DecodingError]:
-    from typedjson.annotation import hints_of
+def _compile(type_: Type) -> Decoder:
+    # Each type is decoded by the only stage for its kind, so no stage is tried
+    # and discarded per value.
+    compiler = _compiler_of(type_)
+    stage = None if compiler is None else _instrumented(type_, compiler)
 
-    def _decode(annotation: Tuple[str, Any]) -> Union[Decoded, DecodingError]:
-        key, type_ = annotation
-        value = json.get(key)
-        return decode(type_, value, path + (key,))
+    if stage is None:
 
-    annotations = hints_of(type_)
-    if isinstance(json, dict) and annotations is not None:
-        parameters = tuple(map(_decode, annotations.items()))
+        def _decode_unsupported(json: Any, path: Optional[Path]) -> Any:
+            return _unsupported(path)
 
-        for parameter in parameters:
-            if isinstance(parameter, DecodingError):
-                return parameter
+        return _decode_unsupported
+    else:
+        return stage
 
-        return type_(*parameters)
+
+def _compiler_of(type_: Type) -> Optional[Compiler]:
+    # Classify a type into the kinds in the order of precedence. Classes are the types
+    # with hints which are none of the others, e.g. `int` is not decoded from `{}`.
+    origin = origin_of(type_)
+    if _registered_of(type_) is not None:
+        return _compile_registered
+    elif len(metadata_of(type_)) > 0:
+        return _compile_annotated
+    elif literals_of(type_) is not None:
+        return _compile_literal
+    elif origin is Union:
+        return _compile_union
+    elif origin is tuple:
+        return _compile_tuple
+    elif origin is list:
+        return _compile_list
+    elif origin in _mappings:
+        return _compile_dict
+    elif is_enum(type_):
+        return _compile_enum
+    elif (
+        type_ == float
+        or type_ in (str, int, bool, type(None))
+        or supertype_of(type_) is not None
+    ):
+        return _compile_primitive
+    elif hints_of(type_) is not None:
+        return _compile_class
+    else:
+        return None
+
+
+def _is_class(type_: Type) -> bool:
+    return _compiler_of(type_) is _compile_class
+
+
+def _instrumented(type_: Type, compiler: Compiler) -> Optional[Decoder]:
+    # While profiling, stages record their calls to the profile of the thread under
+    # the names of their compilers, e.g. "union" for `_compile_union`.
+    # Only calls without paths are recorded, so decoding failures again with paths
+    # to locate them does not count the calls twice.
+    stage_ = compiler(type_)
+    if stage_ is None or not _compiling.profiled:
+        return stage_
+
+    stage: Decoder = stage_
+    name = compiler.__name__[len("_compile_") :]
+
+    def _decode(json: Any, path: Optional[Path]) -> Any:
+        if path is not None:
+            return stage(json, path)
+
+        start = perf_counter()
+        result = stage(json, path)
+        seconds = perf_counter() - start
+
+        profile = _profiling.profile
+        if profile is not None:
+            failed = isinstance(result, DecodingError)
+            profile.record(type_, name, seconds, failed)
+
+        return result
+
+    return _decode
+
+
+def _mismatch(path: Optional[Path]) -> DecodingError:
+    return _failure if path is None else DecodingError(TypeMismatch(path))
+
+
+def _unsupported(path: Optional[Path]) -> DecodingError:
+    return _failure if path is None else DecodingError(UnsupportedDecoding(path))
+
+
+def _propagate(error: DecodingError, path: Optional[Path]) -> DecodingError:
+    # Only type mismatches keep the path of the nested value.
+    if path is None or isinstance(error.reason, TypeMismatch):
+        return error
     else:
         return DecodingError(UnsupportedDecoding(path))
 
 
-def decode_as_union(
-    type_: Type[Decoded], json: Any, path: Path
-) -> Union[Decoded, DecodingError]:
-    from typedjson.annotation import args_of
-    from typedjson.annotation import origin_of
+def _compile_registered(type_: Type) -> Optional[Decoder]:
+    decoder_ = _registered_of(type_)
+    if decoder_ is None:
+        return None
 
-    if origin_of(type_) is Union:
-        args = args_of(type_)
-        for type_ in args:
-            if type_.__class__ is TypeVar:
-                return DecodingError(UnsupportedDecoding(path))
+    decoder: Callable[[Any], Any] = decoder_
+
+    def _decode(json: Any, path: Optional[Path]) -> Any:
+        try:
+            return decoder(json)
+        except (TypeError, ValueError):
+            return _mismatch(path)
+
+    return _decode
+
+
+def _compile_annotated(type_: Type) -> Optional[Decoder]:
+    metadata = metadata_of(type_)
+    if len(metadata) == 0:
+        return None
+
+    # Metadata unknown to typedjson is ignored.
+    type__ = unannotated_of(type_)
+    fields = [m.field for m in metadata if isinstance(m, Discriminator)]
+    arrays = [m for m in metadata if isinstance(m, (Array, NumpyArray))]
+    if len(fields) > 0 and origin_of(type__) is Union:
+        return _compile_union(type__, fields[-1])
+    elif len(arrays) > 0 and origin_of(type__) is list:
+        return _compile_array(type__, arrays[-1])
+    else:
+        return _resolve(type__)
+
+
+def _compile_array(type_: Type, marker: Union[Array, NumpyArray]) -> Decoder:
+    element = args_of(type_)[0]
+    base = _base_of(element)
+    if base not in (float, int):
+        return _resolve(type_)
+
+    # Floats are held only by arrays of floats, and integers by those of either.
+    convert: Callable[[List[Any]], Any]
+    if isinstance(marker, Array):
+        typecode = marker.typecode or ("d" if base is float else "q")
+        if typecode not in ("fd" if base is float else "bBhHiIlLqQfd"):
+            raise ValueError(f"{marker!r} cannot hold elements of {type_}")
+
+        def convert(values: List[Any]) -> Any:
+            return array(typecode, values)
+
+    else:
+        import numpy
+
+        dtype_ = marker.dtype
+        if dtype_ is None:
+            dtype_ = numpy.float64 if base is float else numpy.int64
+
+        try:
+            dtype = numpy.dtype(dtype_)
+        except TypeError as e:
+            raise ValueError(f"{marker!r} cannot hold elements of {type_}") from e
+
+        if dtype.kind not in ("f" if base is float else "iuf"):
+            raise ValueError(f"{marker!r} cannot hold elements of {type_}")
+
+        def convert(values: List[Any]) -> Any:
+            return numpy.fromiter(values, dtype, len(values))
+
+    # Lists of numbers are converted at once without decoding elements one by one.
+    # The others are decoded as lists to convert them, or to locate errors.
+    kinds = _kinds_of(element)
+    decoder = _resolve(type_)
+
+    def _decode(json: Any, path: Optional[Path]) -> Any:
+        if json.__class__ is not list or not set(map(type, json)) <= kinds:
+            json = decoder(json, path)
+            if isinstance(json, DecodingError):
+                return json
+
+        try:
+            return convert(json)
+        except OverflowError:
+            return _mismatch(path)
+
+    return _decode
 
-        for type_ in args:
-            decoded = decode(type_, json, path)
+
+def _compile_literal(type_: Type) -> Optional[Decoder]:
+    values = literals_of(type_)
+    if values is None:
+        return None
+
+    return _compile_table((_json_of(v), v) for v in values)
+
+
+def _compile_enum(type_: Type) -> Optional[Decoder]:
+    return _compile_table((m.value, m) for m in type_)
+
+
+def _compile_table(pairs: Iterable[Tuple[Any, Any]]) -> Decoder:
+    # Values are looked up by their classes too, as `True` does not match `1`.
+    # JSON values of the other classes, e.g. lists, are rejected before hashing.
+    table = {(json.__class__, json): value for json, value in pairs}
+    classes = frozenset(c for c, _ in table.keys())
+    get = table.get
+
+    def _decode(json: Any, path: Optional[Path]) -> Any:
+        if json.__class__ not in classes:
+            return _mismatch(path)
+
+        value = get((json.__class__, json), _failure)
+        return _mismatch(path) if value is _failure else value
+
+    return _decode
+
+
+def _json_of(value: Any) -> Any:
+    # Members of `Enum` in `Literal` are decoded from their values.
+    return value.value if isinstance(value, Enum) else value
+
+
+def _compile_union(type_: Type, field: Optional[str] = None) -> Optional[Decoder]:
+    if origin_of(type_) is not Union:
+        return None
+
+    args = args_of(type_)
+    if any(arg.__class__ is TypeVar for arg in args):
+        return None
+
+    members = tuple(map(_resolve, args))
+
+    def _decode_all(json: Any, path: Optional[Path]) -> Any:
+        for member in members:
+            decoded = member(json, path)
             if not isinstance(decoded, DecodingError):
                 break
 
         return decoded
-    else:
-        return DecodingError(UnsupportedDecoding(path))
 
+    # Members which may accept JSON values of each class with the keys required for
+    # objects, in the order of members.
+    screens = tuple(map(_screen_of, args))
+    candidates = {
+        kind: tuple(
+            (m, keys if kind is dict else frozenset())
+            for m, (kinds, keys) in zip(members, screens)
+            if kind in kinds
+        )
+        for kind in _kinds
+    }
 
-def decode_as_tuple(
-    type_: Type[Decoded], json: Any, path: Path
-) -> Union[Decoded, DecodingError]:
-    from typedjson.annotation import args_of
-    from typedjson.annotation import origin_of
-
-    def _required_length(args: Tuple[Type, ...]) -> int:
-        return len(args) - 2 if args[-1] is ... else len(args)
-
-    def _iter_args(args: Tuple[Type, ...]) -> Iterator[Type]:
-        last: Optional[Type] = None
-        for type_ in args:
-            if type_ is ...:
-                if last is None:
-                    raise
-                else:
-                    while True:
-                        yield last
-            else:
-                yield type_
-            last = type_
-
-    if origin_of(type_) is tuple:
+    # Failures are decoded again with paths by all members to return the same error.
+    def _decode(json: Any, path: Optional[Path]) -> Any:
+        if path is not None:
+            return _decode_all(json, path)
+
+        candidates_ = candidates.get(json.__class__)
+        if candidates_ is None:
+            return _decode_all(json, path)
+
+        for member, keys in candidates_:
+            if len(keys) == 0 or json.keys() >= keys:
+                decoded = member(json, None)
+                if not isinstance(decoded, DecodingError):
+                    return decoded
+
+        return _failure
+
+    tagged = _tagged_of(args, field)
+    if tagged is None:
+        return _decode
+
+    field_, table = tagged
+    classes = frozenset(c for c, _ in table.keys())
+
+    # Decode only the member selected by the tag and try all members for the others.
+    def _decode_tagged(json: Any, path: Optional[Path]) -> Any:
+        if isinstance(json, dict):
+            tag = json.get(field_)
+            if tag.__class__ in classes:
+                member = table.get((tag.__class__, tag))
+                if member is not None:
+                    return member(json, path)
+
+        return _decode(json, path)
+
+    return _decode_tagged
+
+
+# The classes of JSON values parsed by `json.loads`.
+_kinds = (dict, list, str, int, float, bool, type(None))
+
+
+def _screen_of(type_: Type) -> Tuple[FrozenSet[Type], FrozenSet[str]]:
+    # Return the classes of JSON values which the decoder of the type may accept and
+    # the keys which objects must have, i.e. the fields which cannot be `None`.
+    # The keys are empty when the decoder accepts objects without decoding fields.
+    kinds = _kinds_of(type_)
+    if not _is_class(type_):
+        return kinds, frozenset()
+
+    annotations = hints_of(type_)
+    assert annotations is not None
+    keys = frozenset(
+        k for k, t in annotations.items() if type(None) not in _kinds_of(t)
+    )
+    return kinds | _objects_of(type_), keys
+
+
+def _objects_of(type_: Type) -> FrozenSet[Type]:
+    # Return the classes of JSON values accepted by the decoder of a class.
+    # Named tuples are also decoded from arrays, as `json` serializes them so.
+    origin = origin_of(type_)
+    return _named if is_namedtuple(type_ if origin is None else origin) else _object
+
+
+_object: FrozenSet[Type] = frozenset((dict,))
+_named: FrozenSet[Type] = frozenset((dict, list))
+
+
+def _kinds_of(type_: Type) -> FrozenSet[Type]:
+    # Return the classes of JSON values accepted by the decoders other than for
+    # classes, which accept objects. They may include classes which are rejected.
+    if _registered_of(type_) is not None:
+        return frozenset(_kinds)
+
+    if len(metadata_of(type_)) > 0:
+        type__ = unannotated_of(type_)
+        return _screen_of(type__)[0]
+
+    literals = literals_of(type_)
+    if literals is not None:
+        return frozenset(_json_of(v).__class__ for v in literals)
+
+    if is_enum(type_):
+        return frozenset(m.value.__class__ for m in type_)
+
+    origin = origin_of(type_)
+    if origin is Union:
+        args = args_of(type_)
+        if any(arg.__class__ is TypeVar for arg in args):
+            return frozenset()
+
+        kinds_union: FrozenSet[Type] = frozenset()
+        for arg in args:
+            kinds_union |= _kinds_of(arg)
+            if _is_class(arg):
+                kinds_union |= _objects_of(arg)
+
+        return kinds_union
+
+    kinds: Set[Type] = set()
+    if origin is tuple:
+        kinds.update(k for k in _kinds if k is not type(None))
+    elif origin is list:
+        kinds.update((dict, list, str))
+    elif origin in _mappings:
+        kinds.add(dict)
+
+    supertype = supertype_of(type_)
+    if type_ == float:
+        kinds.update((float, int))
+    elif type_ in (str, int, bool, type(None)):
+        kinds.update(k for k in _kinds if issubclass(k, type_))
+    elif supertype is not None:
+        if isinstance(supertype, type):
+            kinds.update(k for k in _kinds if issubclass(k, supertype))
+        else:
+            kinds.update(_kinds)
+
+    return frozenset(kinds)
+
+
+def _tagged_of(
+    args: Tuple[Type, ...], field: Optional[str]
+) -> Optional[Tuple[str, Dict[Tuple[Type, Any], Decoder]]]:
+    # Find a field typed with `Literal` of distinct values in all members, which are
+    # classes except `None` at the end, and map the values to the decoders of members.
+    # Fields marked by `Discriminator` which do not select members are errors.
+    classes = args[:-1] if len(args) > 0 and args[-1] is type(None) else args
+    if len(classes) < 2:
+        return None
+
+    hints: List[Dict[str, Type]] = []
+    for class_ in classes:
+        annotations = hints_of(class_)
+        if annotations is None or not _is_class(class_):
+            return None
+
+        hints.append(annotations)
+
+    for name in hints[0].keys() if field is None else (field,):
+        table: Dict[Tuple[Type, Any], Decoder] = {}
+        for class_, annotations in zip(classes, hints):
+            values = literals_of(annotations.get(name))  # type: ignore
+            if values is None:
+                if field is not None:
+                    raise ValueError(f"{class_} has no field {name!r} of Literal")
+                break
+
+            jsons = tuple(map(_json_of, values))
+            if any((j.__class__, j) in table for j in jsons):
+                if field is not None:
+                    raise ValueError(f"{class_} shares values of {name!r} with others")
+                break
+
+            member = _resolve(class_)
+            table.update(((j.__class__, j), member) for j in jsons)
+        else:
+            return name, table
+
+    return None
+
+
+def _compile_tuple(type_: Type) -> Optional[Decoder]:
+    if origin_of(type_) is not tuple:
+        return None
+
+    args = args_of(type_)
+    variable = len(args) > 0 and args[-1] is ...
+    elements = tuple(map(_resolve, args[:-1] if variable else args))
+    required_length = len(elements) - 1 if variable else len(elements)
+    exact = _exact_of(args[0]) if variable and len(args) == 2 else frozenset()
+
+    def _decode(json: Any, path: Optional[Path]) -> Any:
         if json is None:
-            return DecodingError(TypeMismatch(path))
+            return _mismatch(path)
 
-        list_decoded: List[Any] = []
-        length = len(json)
-        if _required_length(args_of(type_)) > length:
-            return DecodingError(TypeMismatch(path))
+        if required_length > len(json):
+            return _mismatch(path)
 
-        for (index, (type_, element)) in enumerate(
-            zip(_iter_args(args_of(type_)), json)
+        # Tuples are immutable and returned as they are regardless of `reuse_input`.
+        if (
+            len(exact) > 0
+            and json.__class__ in (list, tuple)
+            and set(map(type, json)) <= exact
         ):
-            decoded = decode(type_, element, path + (str(index),))
+            return json if json.__class__ is tuple else tuple(json)
+
+        decoders: Iterable[Decoder] = (
+            chain(elements, repeat(elements[-1])) if variable else elements
+        )
+
+        list_decoded: List[Any] = []
+        for index, (element, value) in enumerate(zip(decoders, json)):
+            decoded = element(value, None if path is None else path + (str(index),))
             if isinstance(decoded, DecodingError):
-                return decoded
+                return _propagate(decoded, path)
 
             list_decoded.append(decoded)
 
-        return tuple(list_decoded)  # type: ignore
-    else:
-        return DecodingError(UnsupportedDecoding(path))
+        return tuple(list_decoded)
 
+    return _decode
 
-def decode_as_list(
-    type_: Type[Decoded], json: Any, path: Path
-) -> Union[Decoded, DecodingError]:
-    from typedjson.annotation import args_of
-    from typedjson.annotation import origin_of
 
-    if origin_of(type_) is list:
-        Element = args_of(type_)[0]
-        list_decoded: List[Any] = []
+def _compile_list(type_: Type) -> Optional[Decoder]:
+    if origin_of(type_) is not list:
+        return None
+
+    element = _resolve(args_of(type_)[0])
+    exact = _exact_of(args_of(type_)[0])
+    reuse_input = _compiling.reuse_input
 
+    def _decode(json: Any, path: Optional[Path]) -> Any:
         if not isinstance(json, Iterable):
-            return DecodingError(TypeMismatch(path))
+            return _mismatch(path)
+
+        # Lists are copied at once when their elements need no conversion.
+        if len(exact) > 0 and json.__class__ is list and set(map(type, json)) <= exact:
+            return json if reuse_input else list(json)
+
+        list_decoded: List[Any] = []
+        if path is None:
+            for value in json:
+                decoded = element(value, None)
+                if isinstance(decoded, DecodingError):
+                    return decoded
 
-        for index, element in enumerate(json):
-            decoded = decode(Element, element, path + (str(index),))
+                list_decoded.append(decoded)
+        else:
+            for index, value in enumerate(json):
+                decoded = element(value, path + (str(index),))
+                if isinstance(decoded, DecodingError):
+                    return _propagate(decoded, path)
+
+                list_decoded.append(decoded)
+
+        return list_decoded
+
+    return _decode
+
+
+def _compile_dict(type_: Type) -> Optional[Decoder]:
+    if origin_of(type_) not in _mappings:
+        return None
+
+    args = args_of(type_)
+    if len(args) != 2 or any(arg.__class__ is TypeVar for arg in args):
+        return None
+
+    # Keys of JSON objects are strings, which `NewType` of `str` does not convert.
+    if _base_of(args[0]) is not str:
+        return None
+
+    value = _resolve(args[1])
+
+    # Objects are copied at once when their values need no conversion.
+    exact = _exact_of(args[1])
+    reuse_input = _compiling.reuse_input
+
+    def _decode(json: Any, path: Optional[Path]) -> Any:
+        if not isinstance(json, dict):
+            return _mismatch(path)
+
+        if (
+            len(exact) > 0
+            and set(map(type, json.values())) <= exact
+            and set(map(type, json.keys())) <= _str
+        ):
+            return json if reuse_input else dict(json)
+
+        dict_decoded: Dict[str, Any] = {}
+        for k, v in json.items():
+            if not isinstance(k, str):
+                return _mismatch(None if path is None else path + (str(k),))
+
+            decoded = value(v, None if path is None else path + (k,))
             if isinstance(decoded, DecodingError):
-                return decoded
+                return _propagate(decoded, path)
 
-            list_decoded.append(decoded)
+            dict_decoded[k] = decoded
+
+        return dict_decoded
+
+    return _decode
+
+
+_str = frozenset((str,))
+
+
+def _base_of(type_: Type) -> Type:
+    # Return the type which `NewType` is based on, or the type itself for the others.
+    supertype = supertype_of(type_)
+    return type_ if supertype is None else _base_of(supertype)
+
+
+def _exact_of(type_: Type) -> FrozenSet[Type]:
+    # Return the classes of JSON values which the decoder of the type returns as they
+    # are, e.g. `float` but not `int` for `float`.
+    supertype = supertype_of(type_)
+    if _registered_of(type_) is not None:
+        return frozenset()
+    elif type_ in (str, int, bool, type(None)):
+        return frozenset(k for k in _kinds if issubclass(k, type_))
+    elif type_ is float:
+        return frozenset((float,))
+    elif supertype is not None:
+        return _exact_of(supertype)
+    elif origin_of(type_) is Union:
+        # Members which convert some values may convert the values of the others.
+        exact: FrozenSet[Type] = frozenset()
+        for arg in args_of(type_):
+            exact_arg = _exact_of(arg)
+            if exact_arg != _kinds_of(arg):
+                return frozenset()
+
+            exact |= exact_arg
+
+        return exact
+    else:
+        return frozenset()
+
+
+def _compile_primitive(type_: Type) -> Optional[Decoder]:
+    supertype = supertype_of(type_)
+    if type_ == float:
+
+        def _decode_float(json: Any, path: Optional[Path]) -> Any:
+            return float(json) if type(json) in (float, int) else _mismatch(path)
+
+        return _decode_float
+    elif type_ in (str, int, bool, type(None)):
+
+        def _decode(json: Any, path: Optional[Path]) -> Any:
+            return json if isinstance(json, type_) else _mismatch(path)
+
+        return _decode
+    elif supertype is not None:
+        base: Type = supertype
 
-        return list(list_decoded)  # type: ignore
+        def _decode_newtype(json: Any, path: Optional[Path]) -> Any:
+            return type_(json) if isinstance(json, base) else _mismatch(path)
+
+        return _decode_newtype
     else:
+        return None
+
+
+def _compile_class(type_: Type) -> Optional[Decoder]:
+    annotations = hints_of(type_)
+    if annotations is None:
+        return None
+
+    fields = tuple((key, _resolve(t)) for key, t in annotations.items())
+    named = list in _objects_of(type_)
+
+    def _decode_array(json: Any, path: Optional[Path]) -> Any:
+        if len(json) != len(fields):
+            return _mismatch(path)
+
+        parameters: List[Any] = []
+        for index, ((_, field), value) in enumerate(zip(fields, json)):
+            decoded = field(value, None if path is None else path + (str(index),))
+            if isinstance(decoded, DecodingError):
+                return _propagate(decoded, path)
+
+            parameters.append(decoded)
+
+        return type_(*parameters)
+
+    def _decode(json: Any, path: Optional[Path]) -> Any:
+        if not isinstance(json, dict):
+            if named and json.__class__ is list:
+                return _decode_array(json, path)
+
+            return _unsupported(path)
+
+        parameters: List[Any] = []
+        for key, field in fields:
+            decoded = field(json.get(key), None if path is None else path + (key,))
+            if isinstance(decoded, DecodingError):
+                return _propagate(decoded, path)
+
+            parameters.append(decoded)
+
+        return type_(*parameters)
+
+    return _decode
+
+
+# Decode values of the types of the kinds with the compiled decoders, and fail for
+# the types of the other kinds.
+def decode_as_primitive(
+    type_: Type[Decoded], json: Any, path: Path
+) -> Union[Decoded, DecodingError]:
+    return _decode_as(_compile_primitive, type_, json, path)
+
+
+def decode_as_class(
+    type_: Type[Decoded], json: Any, path: Path
+) -> Union[Decoded, DecodingError]:
+    return _decode_as(_compile_class, type_, json, path)
+
+
+def decode_as_union(
+    type_: Type[Decoded], json: Any, path: Path
+) -> Union[Decoded, DecodingError]:
+    return _decode_as(_compile_union, type_, json, path)
+
+
+def decode_as_tuple(
+    type_: Type[Decoded], json: Any, path: Path
+) -> Union[Decoded, DecodingError]:
+    return _decode_as(_compile_tuple, type_, json, path)
+
+
+def decode_as_list(
+    type_: Type[Decoded], json: Any, path: Path
+) -> Union[Decoded, DecodingError]:
+    return _decode_as(_compile_list, type_, json, path)
+
+
+def _decode_as(
+    compiler: Compiler, type_: Type[Decoded], json: Any, path: Path
+) -> Union[Decoded, DecodingError]:
+    if _compiler_of(type_) is not compiler:
         return DecodingError(UnsupportedDecoding(path))
+
+    decoded: Union[Decoded, DecodingError] = _entry_of(type_, False, False)(json, path)
+    return decoded
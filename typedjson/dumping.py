@@ -1,45 +1,596 @@
 #!/usr/bin/env python3
 
+import threading
+from enum import Enum
+from functools import lru_cache
+from itertools import repeat
+from json import JSONEncoder
+from json.encoder import encode_basestring_ascii  # type: ignore
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import IO
+from typing import Iterable
+from typing import Iterator
 from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+from typing import Union
 
+from typedjson.annotation import _mappings
+from typedjson.annotation import args_of
+from typedjson.annotation import hints_of
+from typedjson.annotation import is_enum
+from typedjson.annotation import is_namedtuple
+from typedjson.annotation import literals_of
+from typedjson.annotation import metadata_of
+from typedjson.annotation import origin_of
+from typedjson.annotation import supertype_of
+from typedjson.annotation import unannotated_of
+from typedjson.decoding import _Proxy
+from typedjson.decoding import Array
+from typedjson.decoding import DecodingError
+from typedjson.decoding import force
+from typedjson.decoding import NumpyArray
 
-def _serialize(decoded: Any) -> Any:
-    if isinstance(decoded, tuple) or isinstance(decoded, list):
-        return tuple(map(_serialize, decoded))
+# Encoders return values which the `json` module can serialize.
+# `None` stands for values which need no conversion.
+Encoder = Callable[[Any], Any]
+
+# Streamers write values as chunks of JSON text with the indent at the level.
+Streamer = Callable[[Any, Optional[str], int], Iterator[str]]
+
+
+_primitives = (str, int, float, bool, type(None))
+
+# Strings are quoted by the C function of `json`, which typeshed does not declare.
+_quoted: Callable[[str], str] = encode_basestring_ascii
+
+
+def register_encoder(type_: Type, encoder: Encoder) -> None:
+    # Encode values of exactly the type by the function, which returns values
+    # which the `json` module can serialize.
+    if type_ in _primitives:
+        raise ValueError(f"Encoding {type_} cannot be replaced")
+
+    _encoders[type_] = encoder
+    _encoder_of.cache_clear()
+    _shallow_of.cache_clear()
+    _streamer_of.cache_clear()
+
+
+def _isoformat_of(class_: Type) -> Encoder:
+    isoformat: Encoder = class_.isoformat
+    return isoformat
+
+
+# Encoders registered for classes, which are looked up by the classes of values.
+_encoders: Dict[Any, Encoder] = {}
+
+
+# Encoders of standard classes keyed by the qualified names of the classes, which are
+# registered when the classes are looked up first like those of decoders.
+_standard_encoders: Dict[str, Callable[[Type], Encoder]] = {
+    "datetime.datetime": _isoformat_of,
+    "datetime.date": _isoformat_of,
+    "datetime.time": _isoformat_of,
+    "decimal.Decimal": lambda class_: str,
+    "uuid.UUID": lambda class_: str,
+}
+
+
+def _registered_of(class_: Any) -> Optional[Encoder]:
+    encoder = _encoders.get(class_)
+    if encoder is None and isinstance(class_, type):
+        standard = _standard_encoders.get(f"{class_.__module__}.{class_.__qualname__}")
+        if standard is not None:
+            encoder = _encoders[class_] = standard(class_)
+
+    return encoder
 
-    dict_ = getattr(decoded, "__dict__", None)
-    if dict_ is None:
+
+def _serialize(decoded: Any) -> Any:
+    # Convert values into what `json` can serialize without types, e.g. objects into
+    # dictionaries of their attributes and named tuples into objects, which `json`
+    # would serialize into arrays.
+    if decoded.__class__ in _primitives:
         return decoded
 
-    serialized: Dict[str, Any] = {}
-    for k, v in dict_.items():
-        serialized[k] = _serialize(v)
+    shallow = _shallow_of(decoded.__class__)(decoded)
+    if isinstance(shallow, dict):
+        return _serialize_dict(shallow)
+    elif isinstance(shallow, (list, tuple)):
+        return _serialize_sequence(shallow)
+    else:
+        return shallow
 
-    return serialized
 
+# Primitive elements are checked in place to save calls for them.
+def _serialize_sequence(decoded: Any) -> Any:
+    return [v if v.__class__ in _primitives else _serialize(v) for v in decoded]
 
-def dump(decoded: Any, file_: IO[str], indent: Optional[int] = None) -> None:
-    import json
 
-    from typedjson import DecodingError
+def _serialize_dict(decoded: Any) -> Any:
+    return {
+        k: v if v.__class__ in _primitives else _serialize(v)
+        for k, v in decoded.items()
+    }
 
-    if isinstance(decoded, DecodingError):
-        raise decoded
+
+@lru_cache(maxsize=1024)
+def _shallow_of(class_: Type) -> Encoder:
+    # Convert values of the class into primitives, lists or dictionaries whose
+    # elements are not converted yet.
+    registered = _registered_of(class_)
+    if registered is not None:
+        return registered
+    elif issubclass(class_, Enum):
+        return _value
+    elif is_namedtuple(class_):
+        return _fields_of_named
+    elif issubclass(class_, (list, tuple, dict)):
+        return _identity
+    elif issubclass(class_, (str, int, float)):
+        return next(t for t in (str, int, float) if issubclass(class_, t))
+    elif issubclass(class_, _Proxy):
+        # Lazily decoded proxies are decoded with all their fields.
+        return _fields_of_proxy
+
+    slots = _slots_of(class_)
+
+    def _fields_of_object(decoded: Any) -> Any:
+        dict_ = getattr(decoded, "__dict__", None)
+        if len(slots) == 0:
+            return _tolist(decoded) if dict_ is None else dict_
+
+        fields = {k: getattr(decoded, k) for k in slots}
+        fields.update({} if dict_ is None else dict_)
+        return fields
+
+    return _fields_of_object
+
+
+def _fields_of_named(decoded: Any) -> Any:
+    return {k: getattr(decoded, k) for k in decoded._fields}
+
+
+def _fields_of_proxy(decoded: Any) -> Any:
+    forced = force(decoded)
+    return _shallow_of(forced.__class__)(forced)
+
+
+@lru_cache(maxsize=1024)
+def _slots_of(type_: Type) -> Tuple[str, ...]:
+    slots: Tuple[str, ...] = ()
+    for t in reversed(type_.__mro__):
+        names = getattr(t, "__slots__", ())
+        names = (names,) if isinstance(names, str) else names
+        slots += tuple(n for n in names if n not in ("__dict__", "__weakref__"))
+
+    return slots
+
+
+def compile_encoder(type_: Type) -> Encoder:
+    # Analyze the type once and return an encoder specialized for it.
+    # The encoder converts values of the type into what `json` can serialize.
+    encoder = _encoder_of(type_)
+    return _identity if encoder is None else encoder
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+@lru_cache(maxsize=1024)
+def _encoder_of(type_: Any) -> Optional[Encoder]:
+    _compiling.types.add(type_)
+    try:
+        return _compile(type_)
+    finally:
+        _compiling.types.discard(type_)
+
+
+class _Compiling(threading.local):
+    def __init__(self) -> None:
+        self.types: Set[Type] = set()
+        self.streamed: Set[Type] = set()
+
+
+_compiling = _Compiling()
+
+
+def _resolve(type_: Type) -> Optional[Encoder]:
+    if type_ in _compiling.types:
+
+        def _deferred(value: Any) -> Any:
+            return compile_encoder(type_)(value)
+
+        return _deferred
+    else:
+        return _encoder_of(type_)
+
+
+def _compile(type_: Type) -> Optional[Encoder]:
+    origin = origin_of(type_)
+    args = args_of(type_)
+
+    registered = _registered_of(type_)
+    if registered is not None:
+        return registered
+    elif len(metadata_of(type_)) > 0:
+        if any(isinstance(m, (Array, NumpyArray)) for m in metadata_of(type_)):
+            return _tolist
+        else:
+            return _resolve(unannotated_of(type_))
+    elif literals_of(type_) is not None:
+        literals = literals_of(type_)
+        assert literals is not None
+        return _value if any(isinstance(v, Enum) for v in literals) else None
+    elif is_enum(type_):
+        return _value
+    elif origin is Union:
+        members = tuple(map(_resolve, args))
+        if all(m is None for m in members):
+            return None
+        elif len(args) == 2 and args[1] is type(None):
+            member = members[0]
+            assert member is not None
+            encoder: Encoder = member
+
+            def _encode_optional(value: Any) -> Any:
+                return None if value is None else encoder(value)
+
+            return _encode_optional
+        else:
+            return _encode_union_of(args)
+    elif origin in (list, tuple):
+        if len(args) == 0 or any(a.__class__ is TypeVar for a in args):
+            return _serialize
+
+        elements = tuple(_resolve(a) for a in args if a is not ...)
+        if all(e is None for e in elements):
+            return None
+        elif origin is list or args[-1] is ...:
+            element_ = elements[0]
+            assert element_ is not None
+            element: Encoder = element_
+
+            def _encode_sequence(value: Any) -> Any:
+                return [element(v) for v in value]
+
+            return _encode_sequence
+        else:
+            encoders = tuple(_identity if e is None else e for e in elements)
+
+            def _encode_tuple(value: Any) -> Any:
+                return [e(v) for e, v in zip(encoders, value)]
+
+            return _encode_tuple
+    elif origin in _mappings:
+        if len(args) != 2 or any(a.__class__ is TypeVar for a in args):
+            return _serialize
+
+        encoder_value_ = _resolve(args[1])
+        if encoder_value_ is None:
+            return None
+
+        encoder_value: Encoder = encoder_value_
+
+        def _encode_dict(value: Any) -> Any:
+            return {k: encoder_value(v) for k, v in value.items()}
+
+        return _encode_dict
+    elif type_ in _primitives or supertype_of(type_) is not None:
+        return None
+
+    # Types without hints for fields are serialized with their attributes.
+    annotations = hints_of(type_)
+    if not annotations or any(t.__class__ is TypeVar for t in annotations.values()):
+        return _serialize
+
+    fields = tuple((k, _resolve(t)) for k, t in annotations.items())
+
+    def _encode_class(value: Any) -> Any:
+        serialized: Dict[str, Any] = {}
+        for key, encoder in fields:
+            v = getattr(value, key)
+            serialized[key] = v if encoder is None else encoder(v)
+
+        return serialized
+
+    return _encode_class
+
+
+def _classes_of(args: Tuple[Type, ...]) -> Dict[Type, Type]:
+    # Map the classes of members to the members to look up by the classes of values.
+    # Members which are not classes or share their classes with other members are
+    # left to the encoding of the values without types.
+    members: Dict[Type, Type] = {}
+    shared: Set[Type] = set()
+    for t in args:
+        class_ = origin_of(t) or t
+        if len(metadata_of(t)) > 0 or not isinstance(class_, type):
+            continue
+        elif class_ in members:
+            shared.add(class_)
+        else:
+            members[class_] = t
+
+    for class_ in shared:
+        del members[class_]
+
+    return members
+
+
+def _encode_union_of(args: Tuple[Type, ...]) -> Encoder:
+    encoders = {c: _resolve(t) for c, t in _classes_of(args).items()}
+
+    def _encode_union(value: Any) -> Any:
+        encoder = encoders.get(value.__class__, _serialize)
+        return value if encoder is None else encoder(value)
+
+    return _encode_union
+
+
+def _value(value: Any) -> Any:
+    # Members of `Enum` are serialized into their values.
+    return value.value if isinstance(value, Enum) else value
+
+
+def _tolist(value: Any) -> Any:
+    # Arrays of `array` and NumPy are converted into lists of Python numbers.
+    # The other values are left as they are to be rejected with `TypeError`.
+    tolist = getattr(value, "tolist", None)
+    return value if tolist is None else tolist()
+
+
+@lru_cache(maxsize=1024)
+def _streamer_of(type_: Any) -> Streamer:
+    _compiling.streamed.add(type_)
+    try:
+        return _compile_streamer(type_)
+    finally:
+        _compiling.streamed.discard(type_)
+
+
+def _resolve_streamer(type_: Type) -> Streamer:
+    if type_ in _compiling.streamed:
+
+        def _deferred(value: Any, indent: Optional[str], level: int) -> Iterator[str]:
+            return _streamer_of(type_)(value, indent, level)
+
+        return _deferred
     else:
-        serialized = _serialize(decoded)
-        json.dump(serialized, file_, indent=indent)
+        return _streamer_of(type_)
+
+
+def _compile_streamer(type_: Type) -> Streamer:
+    # Classes and containers are written per field and element with the streamers
+    # for their types. The other values are converted by the encoders for their
+    # types and written as they are.
+    encoder_ = _encoder_of(type_)
+    if encoder_ is None or encoder_ is _serialize:
+        return _stream
+
+    origin = origin_of(type_)
+    args = args_of(type_)
+    if (
+        _registered_of(type_) is not None
+        or literals_of(type_) is not None
+        or is_enum(type_)
+    ):
+        return _converting(encoder_)
+    elif len(metadata_of(type_)) > 0:
+        if any(isinstance(m, (Array, NumpyArray)) for m in metadata_of(type_)):
+            return _converting(encoder_)
+        else:
+            return _resolve_streamer(unannotated_of(type_))
+    elif origin is Union:
+        if len(args) == 2 and args[1] is type(None):
+            member = _resolve_streamer(args[0])
+
+            def _stream_optional(
+                value: Any, indent: Optional[str], level: int
+            ) -> Iterator[str]:
+                return (
+                    iter(("null",)) if value is None else member(value, indent, level)
+                )
+
+            return _stream_optional
+
+        members = {c: _resolve_streamer(t) for c, t in _classes_of(args).items()}
+
+        def _stream_union(
+            value: Any, indent: Optional[str], level: int
+        ) -> Iterator[str]:
+            return members.get(value.__class__, _stream)(value, indent, level)
 
+        return _stream_union
+    elif origin in (list, tuple):
+        elements = tuple(_resolve_streamer(a) for a in args if a is not ...)
+        if origin is tuple and args[-1] is not ...:
+
+            def _stream_tuple(
+                value: Any, indent: Optional[str], level: int
+            ) -> Iterator[str]:
+                return _stream_array(value, elements, indent, level)
+
+            return _stream_tuple
+
+        element = elements[0]
+
+        def _stream_sequence(
+            value: Any, indent: Optional[str], level: int
+        ) -> Iterator[str]:
+            return _stream_array(value, repeat(element), indent, level)
+
+        return _stream_sequence
+    elif origin in _mappings:
+        value_ = _resolve_streamer(args[1])
+
+        def _stream_dict(
+            value: Any, indent: Optional[str], level: int
+        ) -> Iterator[str]:
+            return _stream_object(value.items(), repeat(value_), indent, level)
+
+        return _stream_dict
+    else:
+        annotations = hints_of(type_)
+        assert annotations is not None
+        names = tuple(annotations.keys())
+        fields = tuple(map(_resolve_streamer, annotations.values()))
 
-def dumps(decoded: Any, indent: Optional[int] = None) -> str:
-    import json
+        def _stream_class(
+            value: Any, indent: Optional[str], level: int
+        ) -> Iterator[str]:
+            items = ((k, getattr(value, k)) for k in names)
+            return _stream_object(items, fields, indent, level)
 
-    from typedjson import DecodingError
+        return _stream_class
 
+
+def _converting(encoder: Encoder) -> Streamer:
+    def _stream_converted(
+        value: Any, indent: Optional[str], level: int
+    ) -> Iterator[str]:
+        return _stream(encoder(value), indent, level)
+
+    return _stream_converted
+
+
+def _stream(value: Any, indent: Optional[str], level: int) -> Iterator[str]:
+    # Write values without types like `_serialize` converts them.
+    if value.__class__ not in _primitives:
+        value = _shallow_of(value.__class__)(value)
+
+    if value.__class__ in _primitives:
+        yield _text(value)
+    elif isinstance(value, dict):
+        yield from _stream_object(value.items(), repeat(_stream), indent, level)
+    elif isinstance(value, (list, tuple)):
+        yield from _stream_array(value, repeat(_stream), indent, level)
+    else:
+        name = value.__class__.__name__
+        raise TypeError(f"Object of type {name} is not JSON serializable")
+
+
+def _stream_array(
+    values: Iterable[Any],
+    streamers: Iterable[Streamer],
+    indent: Optional[str],
+    level: int,
+) -> Iterator[str]:
+    # Primitive elements are written in place to save calls for them.
+    newline = "" if indent is None else "\n" + indent * (level + 1)
+    separator = ", " if indent is None else "," + newline
+    prefix = "[" + newline
+    for v, stream in zip(values, streamers):
+        if v.__class__ in _primitives:
+            yield prefix + _text(v)
+        else:
+            yield prefix
+            yield from stream(v, indent, level + 1)
+
+        prefix = separator
+
+    if prefix is separator:
+        yield ("" if indent is None else "\n" + indent * level) + "]"
+    else:
+        yield "[]"
+
+
+def _stream_object(
+    items: Iterable[Tuple[Any, Any]],
+    streamers: Iterable[Streamer],
+    indent: Optional[str],
+    level: int,
+) -> Iterator[str]:
+    newline = "" if indent is None else "\n" + indent * (level + 1)
+    separator = ", " if indent is None else "," + newline
+    prefix = "{" + newline
+    for (k, v), stream in zip(items, streamers):
+        key = prefix + _key_text(k) + ": "
+        if v.__class__ in _primitives:
+            yield key + _text(v)
+        else:
+            yield key
+            yield from stream(v, indent, level + 1)
+
+        prefix = separator
+
+    if prefix is separator:
+        yield ("" if indent is None else "\n" + indent * level) + "}"
+    else:
+        yield "{}"
+
+
+def _text(value: Any) -> str:
+    # Primitives are written like `json` does by default.
+    if value.__class__ is str:
+        return _quoted(value)
+    elif value is None:
+        return "null"
+    elif value is True:
+        return "true"
+    elif value is False:
+        return "false"
+    elif value.__class__ is int:
+        return int.__repr__(value)
+    elif value != value:
+        return "NaN"
+    elif value in (float("inf"), float("-inf")):
+        return "Infinity" if value > 0 else "-Infinity"
+    else:
+        return float.__repr__(value)
+
+
+def _key_text(key: Any) -> str:
+    # Keys which are not strings are written as strings like `json` does.
+    if key.__class__ is str:
+        return _quoted(key)
+    elif key.__class__ in _primitives:
+        return _quoted(_text(key))
+    else:
+        name = key.__class__.__name__
+        raise TypeError(f"keys must be str, int, float, bool or None, not {name}")
+
+
+def _encoder(indent: Optional[int]) -> JSONEncoder:
+    return JSONEncoder(indent=indent)
+
+
+def dump(
+    decoded: Any,
+    file_: IO[str],
+    indent: Optional[int] = None,
+    type_: Optional[Type] = None,
+) -> None:
+    for chunk in dumps_iter(decoded, indent=indent, type_=type_):
+        file_.write(chunk)
+
+
+def dumps(
+    decoded: Any, indent: Optional[int] = None, type_: Optional[Type] = None
+) -> str:
+    # The whole text is returned at once, so values are converted at once to be
+    # serialized by the C encoder of `json`.
     if isinstance(decoded, DecodingError):
         raise decoded
+    elif type_ is None:
+        return _encoder(indent).encode(_serialize(decoded))
     else:
-        serialized = _serialize(decoded)
-        return json.dumps(serialized, indent=indent)
+        return _encoder(indent).encode(compile_encoder(type_)(decoded))
+
+
+def dumps_iter(
+    decoded: Any, indent: Optional[int] = None, type_: Optional[Type] = None
+) -> Iterator[str]:
+    # Serialize objects into chunks of JSON text without building the whole JSON tree.
+    # Each chunk is written when it is reached, so values are converted one by one.
+    if isinstance(decoded, DecodingError):
+        raise decoded
+
+    stream = _stream if type_ is None else _streamer_of(type_)
+    return stream(decoded, None if indent is None else " " * indent, 0)
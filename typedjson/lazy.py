@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+
+from dataclasses import is_dataclass
+from functools import lru_cache
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+from typing import Union
+
+from typedjson.annotation import args_of
+from typedjson.annotation import hints_of
+from typedjson.annotation import key_of
+from typedjson.annotation import origin_of
+from typedjson.decoding import _entry_of
+from typedjson.decoding import _is_class
+from typedjson.decoding import _propagate
+from typedjson.decoding import _Proxy
+from typedjson.decoding import DecodingError
+from typedjson.decoding import force
+from typedjson.decoding import Path
+
+# Lazy decoders take paths always because failures are not decoded again.
+LazyDecoder = Callable[[Any, Path], Any]
+
+# Selected fields by name with the fields selected in them, which are empty when
+# the fields are selected entirely. Elements of lists are selected by "*".
+Selection = Tuple[Tuple[str, Any], ...]
+
+
+def decode_lazily(type_: Type, json: Any, path: Path) -> Any:
+    return _lazy_of(type_, key_of(type_))(json, path)
+
+
+def decode_partially(
+    type_: Type, json: Any, path: Path, only: FrozenSet[Union[str, Path]]
+) -> Any:
+    return _projection_of(type_, key_of(type_), _selection_of(only))(json, path)
+
+
+@lru_cache(maxsize=1024)
+def _selection_of(only: FrozenSet[Union[str, Path]]) -> Selection:
+    # Paths are joined with "." like "owner.name.first" or given as tuples.
+    tree: Dict[str, Any] = {}
+    for path in only:
+        keys = path.split(".") if isinstance(path, str) else path
+        node: Optional[Dict[str, Any]] = tree
+        for index, key in enumerate(keys):
+            if node is None:
+                break
+            elif index == len(keys) - 1:
+                node[key] = None
+            else:
+                node = node.setdefault(key, {})
+
+    return _freeze(tree)
+
+
+def _freeze(tree: Dict[str, Any]) -> Selection:
+    return tuple((k, () if v is None else _freeze(v)) for k, v in sorted(tree.items()))
+
+
+@lru_cache(maxsize=1024)
+def _projection_of(type_: Type, key: Any, selection: Selection) -> LazyDecoder:
+    # Decode the selected fields and return proxies which decode the others lazily.
+    # The types which cannot be proxied are decoded entirely, and so are values
+    # which fail to report the same errors as decoding them eagerly.
+    eager = _entry_of(type_, False, False)
+    if len(selection) == 0:
+        return eager
+
+    origin = origin_of(type_)
+    args = args_of(type_)
+
+    if _is_proxied(type_):
+        proxy = _lazy_decoder_of(type_)
+        annotations = hints_of(type_)
+        assert annotations is not None
+
+        fields = []
+        for name, selection_ in selection:
+            t = annotations.get(name)
+            if t is None:
+                raise ValueError(f"{type_} has no field {name!r}")
+
+            fields.append((name, _projection_of(t, key_of(t), selection_)))
+
+        def _decode_proxy(json: Any, path: Path) -> Any:
+            value = proxy(json, path)
+            if isinstance(value, DecodingError):
+                return value
+
+            decoded = value._typedjson_decoded
+            for name, field in fields:
+                field_decoded = field(json.get(name), path + (name,))
+                if isinstance(field_decoded, DecodingError):
+                    return eager(json, path)
+
+                decoded[name] = field_decoded
+
+            return value
+
+        return _decode_proxy
+    elif origin is Union and len(args) == 2 and args[1] is type(None):
+        decoder = _projection_of(args[0], key_of(args[0]), selection)
+
+        def _decode_optional(json: Any, path: Path) -> Any:
+            if json is None:
+                return None
+
+            decoded = decoder(json, path)
+            return eager(json, path) if isinstance(decoded, DecodingError) else decoded
+
+        return _decode_optional
+    elif origin is list and len(args) == 1:
+        if len(selection) != 1 or selection[0][0] != "*":
+            raise ValueError(f"Elements of {type_} are selected only by '*'")
+
+        element = _projection_of(args[0], key_of(args[0]), selection[0][1])
+
+        def _decode_list(json: Any, path: Path) -> Any:
+            if json.__class__ is not list:
+                return eager(json, path)
+
+            list_decoded = []
+            for index, value in enumerate(json):
+                decoded = element(value, path + (str(index),))
+                if isinstance(decoded, DecodingError):
+                    return eager(json, path)
+
+                list_decoded.append(decoded)
+
+            return list_decoded
+
+        return _decode_list
+    else:
+        return eager
+
+
+def _lazy_decoder_of(type_: Type) -> LazyDecoder:
+    return _lazy_of(type_, key_of(type_))
+
+
+@lru_cache(maxsize=1024)
+def _lazy_of(type_: Type, key: Any) -> LazyDecoder:
+    # Dataclasses, optional ones and lists of them are decoded into proxies.
+    # The other types are decoded eagerly, and so are values which fail.
+    eager = _entry_of(type_, False, False)
+    origin = origin_of(type_)
+    args = args_of(type_)
+
+    if _is_proxied(type_):
+        proxy = _proxy_of(type_)
+        new = object.__new__
+        # Slots are set via their descriptors, which frozen dataclasses do not block.
+        set_json = proxy._typedjson_json.__set__
+        set_path = proxy._typedjson_path.__set__
+        set_decoded = proxy._typedjson_decoded.__set__
+
+        def _decode_proxy(json: Any, path: Path) -> Any:
+            if not isinstance(json, dict):
+                return eager(json, path)
+
+            value = new(proxy)
+            set_json(value, json)
+            set_path(value, path)
+            set_decoded(value, {})
+            return value
+
+        return _decode_proxy
+    elif origin is Union and len(args) == 2 and args[1] is type(None):
+        if not _is_proxied(args[0]):
+            return eager
+
+        decoder = _lazy_decoder_of(args[0])
+
+        def _decode_optional(json: Any, path: Path) -> Any:
+            if json is None:
+                return None
+
+            decoded = decoder(json, path)
+            return eager(json, path) if isinstance(decoded, DecodingError) else decoded
+
+        return _decode_optional
+    elif origin is list and len(args) == 1 and _is_proxied(args[0]):
+        element = _lazy_decoder_of(args[0])
+
+        def _decode_list(json: Any, path: Path) -> Any:
+            if json.__class__ is not list:
+                return eager(json, path)
+
+            list_decoded = []
+            for index, value in enumerate(json):
+                decoded = element(value, path + (str(index),))
+                if isinstance(decoded, DecodingError):
+                    return eager(json, path)
+
+                list_decoded.append(decoded)
+
+            return list_decoded
+
+        return _decode_list
+    else:
+        return eager
+
+
+def _is_proxied(type_: Type) -> bool:
+    # Only dataclasses whose `__init__` just sets fields can be created without it.
+    # Dataclasses with registered decoders are decoded by them.
+    class_ = origin_of(type_) or type_
+    annotations = hints_of(type_)
+    return (
+        isinstance(class_, type)
+        and is_dataclass(class_)
+        and _is_class(type_)
+        and not hasattr(class_, "__post_init__")
+        and annotations is not None
+        and all(t.__class__ is not TypeVar for t in annotations.values())
+    )
+
+
+def _proxy_of(type_: Type) -> Type:
+    class_ = origin_of(type_) or type_
+    annotations = hints_of(type_)
+    assert annotations is not None
+
+    # Proxies are equal to the instances of the dataclass with the same fields.
+    # Calling their classes, e.g. by `dataclasses.replace`, creates instances of
+    # the dataclass since proxies themselves are created without `__new__`.
+    namespace: Dict[str, Any] = {
+        "__slots__": ("_typedjson_json", "_typedjson_path", "_typedjson_decoded"),
+        "__module__": class_.__module__,
+        "__qualname__": class_.__qualname__,
+        "__eq__": _eq,
+        "__hash__": None if class_.__hash__ is None else _hash,
+        "__new__": _new_of(class_),
+        "__reduce_ex__": _reduce_ex,
+        "_typedjson_type": type_,
+    }
+    for name, t in annotations.items():
+        namespace[name] = _field_of(name, t)
+
+    return type(class_.__name__, (class_, _Proxy), namespace)
+
+
+def _eq(self: Any, x: Any) -> bool:
+    return force(self) == force(x)  # type: ignore
+
+
+def _hash(self: Any) -> int:
+    return hash(force(self))
+
+
+def _new_of(class_: Type) -> Any:
+    def _new(cls: Type, *args: Any, **kwargs: Any) -> Any:
+        return class_(*args, **kwargs)
+
+    return _new
+
+
+def _reduce_ex(self: Any, protocol: Any) -> Any:
+    # Proxies are copied and pickled as the instances of the dataclass, which are
+    # rebuilt by pickle themselves.
+    return _identity, (force(self),)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _field_of(name: str, type_: Type) -> property:
+    # Decoders of fields are looked up on the first access to allow recursive types.
+    # Failures are raised with the paths which decoding the dataclass reports.
+    decoder: Optional[LazyDecoder] = None
+
+    def _get(self: Any) -> Any:
+        nonlocal decoder
+
+        decoded = self._typedjson_decoded
+        if name in decoded:
+            return decoded[name]
+
+        if decoder is None:
+            decoder = _lazy_decoder_of(type_)
+
+        value = decoder(self._typedjson_json.get(name), self._typedjson_path + (name,))
+        if isinstance(value, DecodingError):
+            raise _propagate(value, self._typedjson_path)
+
+        decoded[name] = value
+        return value
+
+    return property(_get)
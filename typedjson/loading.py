@@ -1,33 +1,217 @@
 #!/usr/bin/env python3
 
+import codecs
+import io
+import re
+from importlib import import_module
+from json import JSONDecodeError
+from json import JSONDecoder
+from typing import Any
+from typing import cast
+from typing import Dict
 from typing import IO
+from typing import Iterator
+from typing import Optional
 from typing import Type
 from typing import TypeVar
+from typing import Union
+
+from typing_extensions import Protocol
+
+from typedjson.annotation import args_of
+from typedjson.annotation import origin_of
+from typedjson.decoding import _entry_of
+from typedjson.decoding import decode
+from typedjson.decoding import decode_many
+from typedjson.decoding import DecodingError
 
 Decoded = TypeVar("Decoded")
 
 
-def load(type_: Type[Decoded], file_: IO[str]) -> Decoded:
-    import json
+class Parser(Protocol):
+    # Parse JSON into `dict`, `list`, `str`, `int`, `float`, `bool` and `None`
+    # like `json.loads`.
+    def loads(self, string: Union[str, bytes]) -> Any:
+        ...
+
+
+# Modules compatible with `Parser`, which are imported on demand.
+_builtin_parsers = ("json", "orjson", "ujson")
+
+_parsers: Dict[str, Parser] = {}
+
+
+def register_parser(name: str, parser: Parser) -> None:
+    _parsers[name] = parser
+
+
+def unregister_parser(name: str) -> None:
+    # Built-in parsers are imported again when they are used next.
+    if _parsers.pop(name, None) is None and name not in _builtin_parsers:
+        raise ValueError(f"Unknown JSON parser: {name}")
+
 
-    from typedjson import decode
-    from typedjson import DecodingError
+def _parser_of(parser: Union[str, Parser]) -> Parser:
+    if not isinstance(parser, str):
+        return parser
+
+    parser_ = _parsers.get(parser)
+    if parser_ is None:
+        if parser not in _builtin_parsers:
+            raise ValueError(f"Unknown JSON parser: {parser}")
+        # Modules define `loads` as functions, which mypy does not match to `Parser`.
+        parser_ = _parsers[parser] = cast(Parser, import_module(parser))
+
+    return parser_
+
+
+def load(
+    type_: Type[Decoded],
+    file_: Union[IO[str], IO[bytes]],
+    codegen: bool = False,
+    parser: Union[str, Parser] = "json",
+    workers: Optional[int] = None,
+) -> Decoded:
+    return loads(type_, file_.read(), codegen=codegen, parser=parser, workers=workers)
+
+
+def loads(
+    type_: Type[Decoded],
+    string: Union[str, bytes],
+    codegen: bool = False,
+    parser: Union[str, Parser] = "json",
+    workers: Optional[int] = None,
+) -> Decoded:
+    # Parsed JSON is not shared with callers, so decoders may return it as it is.
+    json = _parser_of(parser).loads(string)
+    decoded: Union[Decoded, DecodingError]
+    if workers is not None and workers > 1:
+        decoded = _decode_list(type_, json, codegen, workers)
+    else:
+        decoded = decode(type_, json, codegen=codegen, reuse_input=True)
 
-    decoded = decode(type_, json.load(file_))
     if isinstance(decoded, DecodingError):
         raise decoded
     else:
         return decoded
 
 
-def loads(type_: Type[Decoded], string: str) -> Decoded:
-    import json
+def _decode_list(
+    type_: Type[Decoded], json: Any, codegen: bool, workers: int
+) -> Union[Decoded, DecodingError]:
+    # Decode elements of a list in parallel. Failures are decoded again serially
+    # to report the same errors as decoding without workers.
+    if origin_of(type_) is not list or not isinstance(json, list):
+        return decode(type_, json, codegen=codegen, reuse_input=True)
 
-    from typedjson import decode
-    from typedjson import DecodingError
+    decoded = decode_many(
+        args_of(type_)[0], json, codegen=codegen, workers=workers, reuse_input=True
+    )
+    if any(isinstance(d, DecodingError) for d in decoded):
+        return decode(type_, json, codegen=codegen, reuse_input=True)
+    else:
+        return decoded  # type: ignore
 
-    decoded = decode(type_, json.loads(string))
-    if isinstance(decoded, DecodingError):
-        raise decoded
+
+def load_iter(
+    type_: Type[Decoded], file_: Union[IO[str], IO[bytes]], codegen: bool = False
+) -> Iterator[Decoded]:
+    # Decode the elements of a top-level JSON array one by one without reading
+    # the whole file. The index of the element is prepended to paths of errors.
+    decoder = _entry_of(type_, codegen, True)
+    for index, json in enumerate(_iter_array(_text_of(file_))):
+        decoded = decoder(json, (str(index),))
+        if isinstance(decoded, DecodingError):
+            raise decoded
+        else:
+            yield decoded
+
+
+def load_lines(
+    type_: Type[Decoded],
+    file_: Union[IO[str], IO[bytes]],
+    codegen: bool = False,
+    parser: Union[str, Parser] = "json",
+) -> Iterator[Decoded]:
+    # Decode JSON Lines (one JSON value per line) one by one. Blank lines are skipped.
+    decoder = _entry_of(type_, codegen, True)
+    parser_ = _parser_of(parser)
+    lines = (line for line in file_ if len(line.strip()) > 0)
+    for index, line in enumerate(lines):
+        decoded = decoder(parser_.loads(line), (str(index),))
+        if isinstance(decoded, DecodingError):
+            raise decoded
+        else:
+            yield decoded
+
+
+def _text_of(file_: Union[IO[str], IO[bytes]]) -> IO[str]:
+    # Unlike `io.TextIOWrapper`, the reader does not close the file when discarded.
+    if isinstance(file_, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(
+        file_, "mode", ""
+    ):
+        return codecs.getreader("utf-8")(file_)  # type: ignore
     else:
-        return decoded
+        return file_  # type: ignore
+
+
+def _iter_array(file_: IO[str], size: int = 1 << 16) -> Iterator[Any]:
+    whitespace = re.compile(r"[ \t\n\r]*")
+    number = re.compile(r"[0-9.eE+\-]*")
+    decoder = JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def _read() -> None:
+        nonlocal buffer, position, eof
+
+        # Read more than the pending text to decode large values in linear time.
+        chunk = file_.read(max(size, len(buffer) - position))
+        eof = len(chunk) == 0
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def _next() -> str:
+        nonlocal position
+
+        while True:
+            position = whitespace.match(buffer, position).end()  # type: ignore
+            if position < len(buffer) or eof:
+                return buffer[position : position + 1]
+            _read()
+
+    if _next() != "[":
+        raise JSONDecodeError("Expecting '['", buffer, position)
+    position += 1
+
+    if _next() == "]":
+        position += 1
+    else:
+        while True:
+            _next()
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except JSONDecodeError:
+                if eof:
+                    raise
+                _read()
+                continue
+
+            # A number at the end of the buffer may continue in the next chunk.
+            if not eof and number.match(buffer, end).end() == len(buffer):  # type: ignore
+                _read()
+                continue
+
+            position = end
+            yield value
+
+            delimiter = _next()
+            position += 1
+            if delimiter == "]":
+                break
+            elif delimiter != ",":
+                raise JSONDecodeError("Expecting ',' delimiter", buffer, position - 1)
+
+    if _next() != "":
+        raise JSONDecodeError("Extra data", buffer, position)
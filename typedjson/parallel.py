@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+
+from typedjson.decoding import _decode_each
+from typedjson.decoding import _decoder_for
+from typedjson.decoding import Decoder
+
+# Each worker receives several chunks to balance the load between workers,
+# and each chunk is large enough to amortize the cost of sending it.
+_chunks_per_worker = 4
+_chunk_size_min = 64
+
+# The decoder compiled in the worker process when the worker starts.
+_decoder: Optional[Decoder] = None
+
+
+def decode_in_parallel(
+    type_: Type,
+    jsons: Sequence[Any],
+    codegen: bool,
+    workers: int,
+    reuse_input: bool,
+    max_errors: int = 1,
+) -> List[Any]:
+    # Decode chunks of JSON in worker processes and return the results in order.
+    # The type is sent to each worker once and compiled there, not with every chunk.
+    size = _chunk_size_of(len(jsons), workers)
+    if len(jsons) <= size:
+        decoder = _decoder_for(type_, codegen, reuse_input, max_errors)
+        return _decode_each(decoder, jsons, 0)
+
+    chunks = [(s, jsons[s : s + size]) for s in range(0, len(jsons), size)]
+    results: List[Any] = []
+    with ProcessPoolExecutor(
+        min(workers, len(chunks)),
+        initializer=_initialize,
+        initargs=(type_, codegen, reuse_input, max_errors),
+    ) as executor:
+        for decoded in executor.map(_decode_chunk, chunks):
+            results.extend(decoded)
+
+    return results
+
+
+def _chunk_size_of(length: int, workers: int) -> int:
+    return max(_chunk_size_min, -(-length // (workers * _chunks_per_worker)))
+
+
+def _initialize(type_: Type, codegen: bool, reuse_input: bool, max_errors: int) -> None:
+    global _decoder
+    _decoder = _decoder_for(type_, codegen, reuse_input, max_errors)
+
+
+def _decode_chunk(chunk: Tuple[int, Sequence[Any]]) -> List[Any]:
+    assert _decoder is not None
+
+    start, jsons = chunk
+    return _decode_each(_decoder, jsons, start)
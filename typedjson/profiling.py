@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from typedjson.decoding import _profiling
+
+
+@dataclass
+class DecoderStats:
+    # Counters of a decoder for a type. The time includes nested values.
+    calls: int = 0
+    failures: int = 0
+    seconds: float = 0.0
+
+    @property
+    def produced(self) -> int:
+        return self.calls - self.failures
+
+
+class Profile:
+    # Counters of decoders keyed by types and the kinds of the decoders
+    # like "class", "union" and "list".
+    def __init__(self) -> None:
+        self.__stats: Dict[Tuple[Any, str], DecoderStats] = {}
+
+    @property
+    def stats(self) -> Dict[Tuple[Any, str], DecoderStats]:
+        return self.__stats
+
+    def record(self, type_: Any, decoder: str, seconds: float, failed: bool) -> None:
+        key = (type_, decoder)
+        stats = self.__stats.get(key)
+        if stats is None:
+            stats = self.__stats[key] = DecoderStats()
+
+        stats.calls += 1
+        stats.failures += failed
+        stats.seconds += seconds
+
+    def rows(self) -> List[Dict[str, Any]]:
+        # Flat records to export, in descending order of time.
+        rows = [
+            {
+                "type": _name_of(type_),
+                "decoder": decoder,
+                "calls": stats.calls,
+                "failures": stats.failures,
+                "produced": stats.produced,
+                "seconds": stats.seconds,
+            }
+            for (type_, decoder), stats in self.__stats.items()
+        ]
+        return sorted(rows, key=lambda r: r["seconds"], reverse=True)
+
+
+def _name_of(type_: Any) -> str:
+    return type_.__qualname__ if isinstance(type_, type) else repr(type_)
+
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    # Record decoding in the context in the thread. Decoders are instrumented only
+    # while profiling, so decoding outside contexts costs nothing for this.
+    # Decoders are not generated as code while profiling.
+    outer = _profiling.profile
+    profile_ = _profiling.profile = Profile()
+    try:
+        yield profile_
+    finally:
+        _profiling.profile = outer
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+from typing import Any
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+import dataclasses
+
+T = TypeVar("T")
+
+
+def slotted(class_: Type[T]) -> Type[T]:
+    # Recreate a dataclass with `__slots__` for its fields.
+    # The instances have no `__dict__` and take less memory than those of dataclasses.
+    if not dataclasses.is_dataclass(class_):
+        raise TypeError(f"{class_.__name__} is not a dataclass")
+
+    # Instances of classes with bases without `__slots__` would keep `__dict__`.
+    for base in class_.__mro__[1:-1]:
+        if "__slots__" not in base.__dict__:
+            raise TypeError(f"{base.__name__} of {class_.__name__} is not slotted")
+
+    names = tuple(f.name for f in dataclasses.fields(class_))
+    inherited = {n for b in class_.__mro__[1:-1] for n in _slots_of(b)}
+
+    namespace = dict(class_.__dict__)
+    namespace["__slots__"] = tuple(n for n in names if n not in inherited)
+    # Default values of fields are class attributes, which conflict with slots.
+    # They are kept by `__init__` generated for the dataclass.
+    for name in names + ("__dict__", "__weakref__"):
+        namespace.pop(name, None)
+
+    # Frozen dataclasses cannot restore attributes with `setattr` when unpickled.
+    if "__getstate__" not in namespace and "__setstate__" not in namespace:
+        namespace["__getstate__"] = _getstate_of(names)
+        namespace["__setstate__"] = _setstate_of(names)
+
+    # Metaclasses of dataclasses are kept, e.g. `ABCMeta`.
+    metaclass: Any = type(class_)
+    slotted_ = metaclass(class_.__name__, class_.__bases__, namespace)
+    slotted_.__qualname__ = class_.__qualname__
+
+    # Methods calling `super()` without arguments refer to the class by the cell
+    # of `__class__`, which is replaced like `dataclass(slots=True)` does.
+    for value in namespace.values():
+        for function in _functions_of(value):
+            _replace_class_cell(function, class_, slotted_)
+
+    return slotted_  # type: ignore
+
+
+def _slots_of(class_: type) -> Tuple[str, ...]:
+    slots = class_.__dict__.get("__slots__", ())
+    return (slots,) if isinstance(slots, str) else tuple(slots)
+
+
+def _functions_of(value: Any) -> Tuple[Any, ...]:
+    if isinstance(value, (classmethod, staticmethod)):
+        return (value.__func__,)
+    elif isinstance(value, property):
+        return (value.fget, value.fset, value.fdel)
+    else:
+        return (value,)
+
+
+def _replace_class_cell(function: Any, old: type, new: type) -> None:
+    code = getattr(function, "__code__", None)
+    if code is None or "__class__" not in code.co_freevars:
+        return
+
+    cell = function.__closure__[code.co_freevars.index("__class__")]
+    if cell.cell_contents is old:
+        cell.cell_contents = new
+
+
+def _getstate_of(names: Tuple[str, ...]) -> Any:
+    def __getstate__(self: Any) -> Tuple[Any, ...]:
+        return tuple(getattr(self, n) for n in names)
+
+    return __getstate__
+
+
+def _setstate_of(names: Tuple[str, ...]) -> Any:
+    def __setstate__(self: Any, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(names, state):
+            object.__setattr__(self, name, value)
+
+    return __setstate__